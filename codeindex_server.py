@@ -1,16 +1,51 @@
 import asyncio
+import base64
+import bisect
+import collections
+import io
+import mmap
 import os
 import re
 import json
+import shutil
+import signal
+import stat
 import traceback
 import time
 import fnmatch
+import functools
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
 from mcp.server import Server
 from mcp.server.stdio import stdio_server
 from mcp.types import Tool, TextContent
 
+# The regex parser moved to re._parser in Python 3.11 (sre_parse is deprecated)
+try:
+    from re import _parser as sre_parse
+except ImportError:
+    import sre_parse
+
+# Try to import orjson (faster response serialization, stdlib json otherwise)
+try:
+    import orjson
+    HAS_ORJSON = True
+except ImportError:
+    HAS_ORJSON = False
+
+# Try to import numpy (vectorized line indexing for large files)
+try:
+    import numpy as np
+    HAS_NUMPY = True
+except ImportError:
+    HAS_NUMPY = False
+
 server = Server("codeindex")
 
+# ripgrep is used for search_text when it is on PATH (pure-Python fallback otherwise)
+RG_PATH = shutil.which("rg")
+
 # =============================================================================
 # FR-0.3: Safety & Limits Configuration
 # =============================================================================
@@ -21,9 +56,37 @@ LIMITS = {
     "timeout_seconds": 300,                     # 5 minute timeout for operations
 }
 
+# Per-file scanning is fanned out to worker processes in batches of this many files;
+# smaller searches are scanned inline. "spawn" avoids forking the threaded event loop.
+SCAN_BATCH_SIZE = 64
+_PROC_POOL = None  # Created on first use by _get_proc_pool()
+
+# Threads that list directories ahead of the walk (scandir releases the GIL)
+SCANDIR_WORKERS = 16
+_SCANDIR_POOL = ThreadPoolExecutor(max_workers=SCANDIR_WORKERS)
+MAX_PENDING_LISTINGS = SCANDIR_WORKERS * 4  # Bounds queued listings (and their entries) per walk
+
+# collect_files results are reused for a few seconds while the root and its top-level
+# directories are unchanged; callers tend to search the same tree several times in a row
+DIR_CACHE_TTL = 5.0
+DIR_CACHE_SIZE = 32
+# (root, file_patterns, exclude) -> (tree signature, walked_at, files), least recently used first
+_DIR_CACHE = collections.OrderedDict()
+
 # =============================================================================
 # FR-0.2: Common Response Schema
 # =============================================================================
+_TIMESTAMP = [0, ""]  # [second, formatted] of the last response
+
+
+def _timestamp() -> str:
+    """Current UTC time for responses, formatted at most once per second."""
+    now = int(time.time())
+    if now != _TIMESTAMP[0]:
+        _TIMESTAMP[:] = [now, time.strftime("%Y-%m-%dT%H:%M:%SZ", time.gmtime(now))]
+    return _TIMESTAMP[1]
+
+
 def create_response(
     tool_name: str,
     status: str,
@@ -35,7 +98,7 @@ def create_response(
     response = {
         "tool": tool_name,
         "status": status,
-        "timestamp": time.strftime("%Y-%m-%dT%H:%M:%SZ", time.gmtime()),
+        "timestamp": _timestamp(),
     }
 
     if data is not None:
@@ -47,20 +110,26 @@ def create_response(
     if metadata is not None:
         response["metadata"] = metadata
 
+    if HAS_ORJSON:
+        return orjson.dumps(
+            response, default=str, option=orjson.OPT_INDENT_2 | orjson.OPT_NON_STR_KEYS
+        ).decode()
     return json.dumps(response, indent=2, default=str)
 
 
 def error_response(tool_name: str, exception: Exception, context: str = None) -> str:
     """Create a standardized error response with full debugging info."""
-    tb_lines = traceback.format_exception(type(exception), exception, exception.__traceback__)
-    tb_snippet = ''.join(tb_lines[-3:]) if len(tb_lines) > 3 else ''.join(tb_lines)
-
     error_detail = {
         "type": type(exception).__name__,
         "message": str(exception),
-        "traceback_snippet": tb_snippet.strip(),
     }
 
+    # Formatting a traceback reads every frame's source file; only pay for it when debugging
+    if os.environ.get("MCP_DEBUG"):
+        tb_lines = traceback.format_exception(type(exception), exception, exception.__traceback__)
+        tb_snippet = ''.join(tb_lines[-3:]) if len(tb_lines) > 3 else ''.join(tb_lines)
+        error_detail["traceback_snippet"] = tb_snippet.strip()
+
     if context:
         error_detail["context"] = context
 
@@ -139,45 +208,777 @@ async def list_tools():
     ]
 
 
+def compile_globs(patterns: list):
+    """Compile glob patterns into one regex (None when there are no patterns)."""
+    if not patterns:
+        return None
+    return _compile_globs(tuple(patterns))
+
+
+@functools.lru_cache(maxsize=64)
+def _compile_globs(patterns: tuple) -> re.Pattern:
+    return re.compile('|'.join(fnmatch.translate(os.path.normcase(p)) for p in patterns))
+
+
+def _list_dir(dirpath: str, exclude_regex=None, prefetch_stat=None):
+    """List one directory. Returns (file entries, subdirectory paths), or None if unreadable."""
+    try:
+        with os.scandir(dirpath) as it:
+            entries = list(it)
+    except OSError:
+        return None
+
+    file_entries = []
+    subdirs = []
+    for entry in entries:
+        try:
+            is_dir = entry.is_dir()
+        except OSError:
+            is_dir = False
+        if not is_dir:
+            file_entries.append(entry)
+            if prefetch_stat is not None and prefetch_stat(entry):
+                # Cached on the entry, so the caller's stat() is free
+                try:
+                    entry.stat()
+                except OSError:
+                    pass
+        elif entry.is_dir(follow_symlinks=False):
+            if exclude_regex is None or not exclude_regex.match(os.path.normcase(entry.name)):
+                subdirs.append(entry.path)
+
+    return file_entries, subdirs
+
+
+def _tree_signature(root: str, root_stat: os.stat_result, exclude_regex=None) -> tuple:
+    """Summarize a tree for cache validation: mtimes of the root and its walked subdirectories.
+
+    A directory's mtime changes when entries are added, removed or renamed in it, so this
+    catches new and deleted files in the top two levels without walking the tree.
+    """
+    children = []
+    try:
+        with os.scandir(root) as it:
+            for entry in it:
+                if not entry.is_dir(follow_symlinks=False):
+                    continue
+                if exclude_regex is not None and exclude_regex.match(os.path.normcase(entry.name)):
+                    continue
+                children.append((entry.name, entry.stat(follow_symlinks=False).st_mtime_ns))
+    except OSError:
+        return None
+    children.sort()
+    return root_stat.st_mtime_ns, tuple(children)
+
+
+def walk_files(root: str, exclude_regex=None, prefetch_stat=None):
+    """Yield (dirpath, file entries) top-down like os.walk, skipping excluded directories.
+
+    Uses os.scandir so file types come from the directory listing instead of extra stats.
+    Symlinked directories are never entered, so link loops can't grow the walk.
+    Subdirectories are listed ahead of time in a thread pool; output order is unchanged.
+    """
+    # [dirpath, listing future or None]; listings are prefetched for the entries popped next
+    stack = [[root, None]]
+    in_flight = 0
+    try:
+        while stack:
+            for item in reversed(stack):
+                if in_flight >= MAX_PENDING_LISTINGS:
+                    break
+                if item[1] is None:
+                    item[1] = _SCANDIR_POOL.submit(_list_dir, item[0], exclude_regex, prefetch_stat)
+                    in_flight += 1
+
+            dirpath, listing = stack.pop()
+            listing = listing.result()
+            in_flight -= 1
+            if listing is None:
+                continue
+
+            file_entries, subdirs = listing
+            yield dirpath, file_entries
+            stack.extend([subdir, None] for subdir in reversed(subdirs))
+    finally:
+        # Stopped early (e.g. file limit reached): drop listings still queued
+        for _, listing in stack:
+            if listing is not None:
+                listing.cancel()
+
+
 def collect_files(root: str, file_patterns: list = None, exclude: list = None) -> list:
-    """Collect files from directory matching patterns."""
+    """Collect files from directory matching patterns (files over the size limit are skipped)."""
     if exclude is None:
         exclude = ["venv", "__pycache__", ".git", "node_modules", ".tox", "build", "dist"]
 
     files = []
 
-    if os.path.isfile(root):
+    # One stat call for the type and size of the root
+    try:
+        root_stat = os.stat(root)
+    except (OSError, ValueError):
+        return []
+
+    if stat.S_ISREG(root_stat.st_mode):
+        if root_stat.st_size > LIMITS["max_file_size_bytes"]:
+            return []
         return [root]
 
-    if not os.path.isdir(root):
+    if not stat.S_ISDIR(root_stat.st_mode):
         return []
 
-    for dirpath, dirnames, filenames in os.walk(root):
-        # Filter excluded directories
-        dirnames[:] = [d for d in dirnames if not any(
-            fnmatch.fnmatch(d, ex) for ex in exclude
-        )]
+    include_regex = compile_globs(file_patterns)
+    exclude_regex = compile_globs(exclude)
+
+    cache_key = (root, None if file_patterns is None else tuple(file_patterns), tuple(exclude))
+    walked_at = time.monotonic()
+    signature = _tree_signature(root, root_stat, exclude_regex)
+    cached = _DIR_CACHE.get(cache_key)
+    if (cached is not None and signature is not None and cached[0] == signature
+            and walked_at - cached[1] < DIR_CACHE_TTL):
+        _DIR_CACHE.move_to_end(cache_key)
+        return list(cached[2])
+
+    def wanted(entry):
+        # Symlinked files would be searched twice when their target is in the tree too
+        if entry.is_symlink():
+            return False
+
+        filename = os.path.normcase(entry.name)
 
-        for filename in filenames:
+        # Check file patterns
+        if include_regex is not None and not include_regex.match(filename):
+            return False
+
+        # Check exclusions
+        return exclude_regex is None or not exclude_regex.match(filename)
+
+    for dirpath, file_entries in walk_files(root, exclude_regex, prefetch_stat=wanted):
+        for entry in file_entries:
             if len(files) >= LIMITS["max_files_per_operation"]:
                 break
 
-            # Check file patterns
-            if file_patterns:
-                if not any(fnmatch.fnmatch(filename, p) for p in file_patterns):
-                    continue
+            if not wanted(entry):
+                continue
 
-            # Check exclusions
-            if any(fnmatch.fnmatch(filename, ex) for ex in exclude):
+            # Check file size (stat info is cached on the entry)
+            try:
+                if not entry.is_file() or entry.stat().st_size > LIMITS["max_file_size_bytes"]:
+                    continue
+            except OSError:
                 continue
 
-            filepath = os.path.join(dirpath, filename)
-            files.append(filepath)
+            files.append(entry.path)
 
         if len(files) >= LIMITS["max_files_per_operation"]:
             break
 
-    return files
+    # Drop expired walks so the cache only holds recently searched trees
+    for key in [key for key, (_, when, _) in _DIR_CACHE.items() if walked_at - when >= DIR_CACHE_TTL]:
+        del _DIR_CACHE[key]
+    if signature is not None:
+        _DIR_CACHE[cache_key] = (signature, walked_at, files)
+        _DIR_CACHE.move_to_end(cache_key)
+        while len(_DIR_CACHE) > DIR_CACHE_SIZE:
+            _DIR_CACHE.popitem(last=False)
+    return list(files)
+
+
+@functools.lru_cache(maxsize=256)
+def _search_regex(pattern: str, flags: int) -> re.Pattern:
+    """Compile a search_text pattern (cached; re's own cache is small and gets flushed)."""
+    return re.compile(pattern, flags)
+
+
+@functools.lru_cache(maxsize=256)
+def _import_regex(module: str) -> re.Pattern:
+    """Compile the combined import regex for a module (cached per module)."""
+    # Patterns for Python imports
+    # import module, import module as alias
+    # from module import something
+    escaped = re.escape(module)
+    import_patterns = [
+        rf'\bimport\s+[\w,\s]*\b{escaped}\b',
+        rf'\bfrom\s+{escaped}(?:\.\w+)*\s+import\b',
+        rf'\bfrom\s+\w+(?:\.\w+)*\s+import\s+[\w,\s]*\b{escaped}\b',
+    ]
+    return re.compile('|'.join(import_patterns))
+
+
+# Files at least this large are memory-mapped instead of read (mmap setup costs more below it)
+MMAP_MIN_SIZE = 64 * 1024
+
+ASCII_CHECK_CHUNK = 256 * 1024
+
+# Pattern syntax whose per-line meaning a whole-file scan can't reproduce
+# (\A anchors every line; lookarounds could see neighbouring lines)
+LINE_ONLY_SYNTAX = ("\\A", "(?=", "(?!", "(?<")
+
+
+@functools.lru_cache(maxsize=256)
+def _needs_line_scan(pattern: str, flags: int) -> bool:
+    """Check whether a pattern must be searched line by line."""
+    if any(syntax in pattern for syntax in LINE_ONLY_SYNTAX):
+        return True
+    # Patterns that match empty after a line's newline produce an extra per-line match there
+    return _search_regex(pattern, flags).match("\n", 1) is not None
+
+
+@functools.lru_cache(maxsize=256)
+def _pattern_literals(pattern: str, flags: int) -> tuple:
+    """Find plain-text parts of a pattern. Returns (literal, required).
+
+    literal is the whole pattern when it has no regex syntax at all; required is the
+    longest literal run every match must contain. Either may be None.
+    """
+    try:
+        parsed = sre_parse.parse(pattern, flags)
+    except Exception:
+        return None, None
+    if parsed.state.flags & re.IGNORECASE:
+        return None, None
+
+    runs = [[]]
+    for op, av in parsed:
+        if op is sre_parse.LITERAL:
+            runs[-1].append(chr(av))
+        else:
+            runs.append([])
+
+    required = max((''.join(run) for run in runs), key=len)
+    if not required or '\ufffd' in required:
+        # U+FFFD may come from decoding errors, so it can't be looked up in the raw bytes
+        return None, None
+    literal = required if len(runs) == 1 else None
+    return literal, required
+
+
+def _literal_matches(haystack, literal):
+    """Yield (start, end, text) for non-overlapping occurrences of a literal."""
+    pos = haystack.find(literal)
+    while pos != -1:
+        yield pos, pos + len(literal), literal
+        pos = haystack.find(literal, pos + len(literal))
+
+
+def _scan_lines(filepath: str, lines: list, regex: re.Pattern, context_lines: int,
+                max_results: int) -> list:
+    """Search a file's lines one at a time."""
+    matches = []
+    for line_num, line in enumerate(lines, 1):
+        for match in regex.finditer(line):
+            if len(matches) >= max_results:
+                break
+
+            # Get context lines
+            context_before = []
+            context_after = []
+
+            if context_lines > 0:
+                start = max(0, line_num - 1 - context_lines)
+                end = min(len(lines), line_num + context_lines)
+                context_before = [l.rstrip('\n\r') for l in lines[start:line_num - 1]]
+                context_after = [l.rstrip('\n\r') for l in lines[line_num:end]]
+
+            match_info = {
+                "file": filepath,
+                "line": line_num,
+                "column": match.start() + 1,
+                "text": line.rstrip('\n\r'),
+                "match": match.group(),
+            }
+
+            if context_before:
+                match_info["context_before"] = context_before
+            if context_after:
+                match_info["context_after"] = context_after
+
+            matches.append(match_info)
+
+        if len(matches) >= max_results:
+            break
+
+    return matches
+
+
+def _is_ascii(data) -> bool:
+    """Check a bytes-like buffer (bytes or mmap) for non-ASCII bytes."""
+    if isinstance(data, bytes):
+        return data.isascii()
+    # Check in slices so a mapped file is never copied whole
+    return all(data[i:i + ASCII_CHECK_CHUNK].isascii() for i in range(0, len(data), ASCII_CHECK_CHUNK))
+
+
+def _ascii_str(data) -> str:
+    return str(data, 'ascii')
+
+
+def _line_offsets(data) -> list:
+    """Find every line start after the first in a bytes-like buffer (numpy compares in C)."""
+    return (np.flatnonzero(np.frombuffer(data, dtype=np.uint8) == 10) + 1).tolist()
+
+
+def _scan_buffer(filepath: str, data, pattern: str, flags: int, context_lines: int,
+                 max_results: int) -> list:
+    """Search a whole file in one pass, mapping matches to lines via a line-offset index."""
+    literal, required = _pattern_literals(pattern, flags)
+    if required is not None and data.find(required.encode()) == -1:
+        # Every match contains this literal, so the regex can't match anywhere
+        return []
+
+    haystack = None
+    if pattern.isascii() and _is_ascii(data):
+        # ASCII text: a bytes regex behaves the same and skips decoding
+        try:
+            regex = _search_regex(pattern.encode(), flags | re.MULTILINE)
+            haystack = data
+        except re.error:
+            pass
+    if haystack is None:
+        haystack = str(data, 'utf-8', errors='replace')
+        regex = _search_regex(pattern, flags | re.MULTILINE)
+
+    if isinstance(haystack, str):
+        newline, as_str = "\n", str
+    else:
+        newline, as_str = b"\n", _ascii_str
+    if _needs_line_scan(pattern, flags):
+        return _scan_lines(filepath, io.StringIO(as_str(haystack)).readlines(),
+                           _search_regex(pattern, flags), context_lines, max_results)
+
+    size = len(haystack)
+    # Line start offsets, extended lazily as matches move through the file
+    offsets = [0]
+    # ...or all at once for large byte buffers, where numpy beats a find() per line
+    bulk_index = HAS_NUMPY and not isinstance(haystack, str) and size >= MMAP_MIN_SIZE
+
+    def index_line():
+        """Record the next line start; returns False once the whole file is indexed."""
+        pos = haystack.find(newline, offsets[-1])
+        if pos == -1 or offsets[-1] == size:
+            return False
+        offsets.append(pos + 1)
+        return True
+
+    def line_text(line_num):
+        end = offsets[line_num] - 1 if line_num < len(offsets) else size
+        return as_str(haystack[offsets[line_num - 1]:end])
+
+    if literal is not None:
+        found = _literal_matches(haystack, literal if isinstance(haystack, str) else literal.encode())
+    else:
+        found = ((match.start(), match.end(), match.group()) for match in regex.finditer(haystack))
+
+    matches = []
+    for start, end, text in found:
+        if start == size and (not size or haystack[-1:] == newline):
+            # Past the last line
+            break
+        if haystack.find(newline, start, end - 1) != -1:
+            # A line-by-line scan can't match across lines; redo this file that way
+            return _scan_lines(filepath, io.StringIO(as_str(haystack)).readlines(),
+                               _search_regex(pattern, flags), context_lines, max_results)
+        if len(matches) >= max_results:
+            break
+
+        if bulk_index:
+            offsets.extend(_line_offsets(haystack))
+            bulk_index = False
+        while offsets[-1] <= start and index_line():
+            pass
+        line_num = bisect.bisect_right(offsets, start)
+
+        match_info = {
+            "file": filepath,
+            "line": line_num,
+            "column": start - offsets[line_num - 1] + 1,
+            "text": line_text(line_num),
+            "match": as_str(text),
+        }
+
+        if context_lines > 0:
+            # Get context lines
+            last = line_num + context_lines
+            while len(offsets) <= last and index_line():
+                pass
+            if len(offsets) <= last:
+                # Ran out of lines; a final line without a newline still counts
+                last = len(offsets) - 1 if offsets[-1] == size else len(offsets)
+            context_before = [line_text(n) for n in range(max(1, line_num - context_lines), line_num)]
+            context_after = [line_text(n) for n in range(line_num + 1, last + 1)]
+            if context_before:
+                match_info["context_before"] = context_before
+            if context_after:
+                match_info["context_after"] = context_after
+
+        matches.append(match_info)
+
+    return matches
+
+
+def _scan_data(filepath: str, data, pattern: str, flags: int, context_lines: int,
+               max_results: int) -> list:
+    """Search a file's contents (bytes or mmap)."""
+    try:
+        # Same newline translation as reading in text mode
+        if data.find(b"\r") != -1:
+            data = data[:].replace(b"\r\n", b"\n").replace(b"\r", b"\n")
+        return _scan_buffer(filepath, data, pattern, flags, context_lines, max_results)
+    except Exception:
+        return []
+
+
+def _scan_file(filepath: str, pattern: str, flags: int, context_lines: int,
+               max_results: int) -> tuple:
+    """Search one file for a pattern. Returns (searched, matches)."""
+    try:
+        with open(filepath, 'rb') as f:
+            if os.fstat(f.fileno()).st_size >= MMAP_MIN_SIZE:
+                # Large files are scanned straight from the page cache, without a copy
+                with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+                    return True, _scan_data(filepath, mm, pattern, flags, context_lines, max_results)
+            data = f.read()
+    except Exception:
+        return False, []
+
+    return True, _scan_data(filepath, data, pattern, flags, context_lines, max_results)
+
+
+def _scan_imports(filepath: str, module: str, max_results: int) -> tuple:
+    """Find import lines for a module in one file. Returns (searched, imports)."""
+    regex = _import_regex(module)
+    imports = []
+    try:
+        with open(filepath, 'rb') as f:
+            data = f.read()
+    except Exception:
+        return False, imports
+
+    # A file that never mentions the module can't import it; skip decoding it at all
+    if '\ufffd' not in module and module.encode() not in data:
+        return True, imports
+
+    # Same lines as reading in text mode (universal newlines)
+    lines = io.StringIO(data.decode('utf-8', errors='replace'), newline=None).readlines()
+
+    for line_num, line in enumerate(lines, 1):
+        # Every alternative needs the module name and "import" verbatim; substring
+        # checks reject almost every line before the regex runs
+        if module in line and "import" in line and regex.search(line):
+            if len(imports) >= max_results:
+                break
+
+            imports.append({
+                "file": filepath,
+                "line": line_num,
+                "text": line.rstrip('\n\r'),
+            })
+
+    return True, imports
+
+
+def _scan_batch(scan, filepaths: list, *args) -> list:
+    """Run a per-file scan over a batch of files (executed in a worker process)."""
+    return [scan(filepath, *args) for filepath in filepaths]
+
+
+def _get_proc_pool() -> ProcessPoolExecutor:
+    """Get the scan worker pool, starting it on first use."""
+    global _PROC_POOL
+    if _PROC_POOL is None:
+        _PROC_POOL = ProcessPoolExecutor(
+            max_workers=os.cpu_count(),
+            mp_context=multiprocessing.get_context("spawn"),
+        )
+    return _PROC_POOL
+
+
+def _discard_proc_pool(pool: ProcessPoolExecutor):
+    """Drop a broken worker pool so the next search starts a fresh one."""
+    global _PROC_POOL
+    if _PROC_POOL is pool:
+        _PROC_POOL = None
+    pool.shutdown(wait=False)
+
+
+async def scan_files(scan, files: list, *args) -> tuple:
+    """Run a per-file scan over files, in order, stopping at max_results.
+
+    Returns (files_searched, results).
+    """
+    max_results = LIMITS["max_results"]
+    loop = asyncio.get_running_loop()
+
+    chunks = [files[i:i + SCAN_BATCH_SIZE] for i in range(0, len(files), SCAN_BATCH_SIZE)]
+    pool = None
+    if len(chunks) == 1:
+        # Not worth the round trip to the pool
+        inline = loop.create_future()
+        inline.set_result(_scan_batch(scan, files, *args, max_results))
+        batches = [inline]
+    else:
+        pool = _get_proc_pool()
+        batches = []
+        try:
+            for chunk in chunks:
+                batches.append(loop.run_in_executor(pool, _scan_batch, scan, chunk, *args, max_results))
+        except BrokenProcessPool:
+            # The pool broke after the last search: replace it and scan this one inline
+            for batch in batches:
+                batch.cancel()
+            _discard_proc_pool(pool)
+            inline = loop.create_future()
+            inline.set_result(_scan_batch(scan, files, *args, max_results))
+            batches = [inline]
+
+    files_searched = 0
+    results = []
+    try:
+        for index, batch in enumerate(batches):
+            try:
+                batch_results = await batch
+            except BrokenProcessPool:
+                # A worker died (killed, out of memory, ...): replace the pool for
+                # later searches and finish this one inline
+                _discard_proc_pool(pool)
+                batch_results = _scan_batch(scan, chunks[index], *args, max_results)
+            for searched, file_results in batch_results:
+                if searched:
+                    files_searched += 1
+                results.extend(file_results[:max_results - len(results)])
+                if len(results) >= max_results:
+                    return files_searched, results
+    finally:
+        # Drop batches that are no longer needed
+        for batch in batches:
+            batch.cancel()
+
+    return files_searched, results
+
+
+def _rg_bytes(obj: dict) -> bytes:
+    """Get the raw bytes of a ripgrep JSON text object (base64 'bytes' is used for non-UTF-8 data)."""
+    if "text" in obj:
+        return obj["text"].encode('utf-8')
+    return base64.b64decode(obj["bytes"])
+
+
+def _rg_text(obj: dict) -> str:
+    """Decode a ripgrep JSON text object."""
+    if "text" in obj:
+        return obj["text"]
+    return _rg_bytes(obj).decode('utf-8', errors='replace')
+
+
+# Characters ripgrep never matches where the Python path can: the "\n" each searched
+# line ends with, and U+FFFD, which invalid UTF-8 decodes to (ripgrep sees raw bytes)
+RG_UNMATCHED_CHARS = (0x0A, 0xFFFD)
+
+# Character class categories containing those characters
+RG_UNMATCHED_CATEGORIES = {
+    0x0A: (sre_parse.CATEGORY_SPACE, sre_parse.CATEGORY_NOT_WORD,
+           sre_parse.CATEGORY_NOT_DIGIT, sre_parse.CATEGORY_LINEBREAK),
+    0xFFFD: (sre_parse.CATEGORY_NOT_SPACE, sre_parse.CATEGORY_NOT_WORD,
+             sre_parse.CATEGORY_NOT_DIGIT, sre_parse.CATEGORY_NOT_LINEBREAK),
+}
+
+
+# \w differs between the engines (ripgrep's includes combining marks), and \b with it
+RG_WORD_CATEGORIES = (sre_parse.CATEGORY_WORD, sre_parse.CATEGORY_NOT_WORD)
+
+
+def _class_matches(items, char: int) -> bool:
+    """Check whether a parsed character class ([...]) matches a character."""
+    negate = any(op is sre_parse.NEGATE for op, _ in items)
+    found = any(
+        (op is sre_parse.LITERAL and av == char)
+        or (op is sre_parse.RANGE and av[0] <= char <= av[1])
+        or (op is sre_parse.CATEGORY and av in RG_UNMATCHED_CATEGORIES[char])
+        for op, av in items
+    )
+    return found != negate
+
+
+def _rg_unsafe(items) -> bool:
+    """Check parsed regex items for constructs ripgrep treats differently from the Python path.
+
+    Anything that can match a character in RG_UNMATCHED_CHARS is unsafe, as are \w and
+    \b, and \A and \Z, which anchor each line in Python but the whole file (or nothing)
+    in ripgrep.
+    """
+    for op, av in items:
+        if op is sre_parse.LITERAL:
+            if av in RG_UNMATCHED_CHARS:
+                return True
+        elif op in (sre_parse.NOT_LITERAL, sre_parse.ANY):
+            return True
+        elif op is sre_parse.IN:
+            if any(_class_matches(av, char) for char in RG_UNMATCHED_CHARS):
+                return True
+            if any(item_op is sre_parse.CATEGORY and item_av in RG_WORD_CATEGORIES for item_op, item_av in av):
+                return True
+        elif op is sre_parse.AT:
+            if av in (sre_parse.AT_BEGINNING_STRING, sre_parse.AT_END_STRING,
+                      sre_parse.AT_BOUNDARY, sre_parse.AT_NON_BOUNDARY):
+                return True
+        elif op is sre_parse.SUBPATTERN:
+            if _rg_unsafe(av[3]):
+                return True
+        elif op is sre_parse.BRANCH:
+            if any(_rg_unsafe(branch) for branch in av[1]):
+                return True
+        elif op in (sre_parse.MAX_REPEAT, sre_parse.MIN_REPEAT):
+            if _rg_unsafe(av[2]):
+                return True
+        else:
+            # Lookarounds, backreferences, conditionals, ...: leave them to Python
+            return True
+    return False
+
+
+@functools.lru_cache(maxsize=256)
+def _rg_compatible(pattern: str, flags: int) -> bool:
+    """Check whether ripgrep reports the same matches as the Python path for a pattern.
+
+    Patterns that can match the empty string are left to Python too: the engines place
+    empty matches differently (and Python reports the extra one at each line end).
+    """
+    try:
+        parsed = sre_parse.parse(pattern, flags)
+    except Exception:
+        return False
+    if parsed.getwidth()[0] == 0:
+        return False
+    return not _rg_unsafe(parsed)
+
+
+async def search_with_ripgrep(
+    pattern: str,
+    files: list,
+    case_sensitive: bool,
+    context_lines: int
+) -> dict:
+    """
+    Run search_text through `rg --json` over collected files and build the same data dict as the Python path.
+
+    Returns None if ripgrep fails without producing matches (e.g. a regex it
+    cannot parse) or a file uses lone CR line endings, so the caller can fall back
+    to the pure-Python search.
+    """
+    # --crlf: the Python path reads in text mode, so CRLF ends a line (for $ and .)
+    # --text: the Python path searches binary files too
+    # --threads=1: files are searched (and reported) in the order given, like the Python path
+    argv = [RG_PATH, "--json", "--no-config", "--crlf", "--text", "--threads=1"]
+    if not case_sensitive:
+        argv.append("--ignore-case")
+    if context_lines > 0:
+        argv += ["--context", str(context_lines)]
+    argv += ["-e", pattern, "--", *files]
+
+    file_index = {filepath: i for i, filepath in enumerate(files)}
+    files_searched = len(files)
+
+    # Python's text mode also ends lines at a lone CR, which ripgrep can't do; look for
+    # such files alongside the search and leave the whole search to Python if there are any
+    lone_cr_proc = await asyncio.create_subprocess_exec(
+        RG_PATH, "--files-with-matches", "--quiet", "--no-config", "--text", "--multiline",
+        "-e", r"(?-u)\r(?:[^\n]|\z)", "--", *files,
+        stdout=asyncio.subprocess.DEVNULL,
+        stderr=asyncio.subprocess.DEVNULL,
+    )
+    proc = await asyncio.create_subprocess_exec(
+        *argv,
+        stdout=asyncio.subprocess.PIPE,
+        stderr=asyncio.subprocess.DEVNULL,
+        limit=4 * LIMITS["max_file_size_bytes"],
+    )
+
+    matches = []
+    files_with_matches = set()
+    file_lines = {}    # line number -> text, for match and context lines of the current file
+    file_matches = []  # (line number, column, match text) for the current file
+    completed = False
+
+    try:
+        async for raw in proc.stdout:
+            event = json.loads(raw)
+            kind = event["type"]
+            data = event["data"]
+
+            if kind == "begin":
+                file_lines = {}
+                file_matches = []
+
+            elif kind in ("match", "context"):
+                line_num = data["line_number"]
+                line_bytes = _rg_bytes(data["lines"])
+                file_lines[line_num] = line_bytes.decode('utf-8', errors='replace').rstrip('\n\r')
+
+                if kind == "match":
+                    for sub in data["submatches"]:
+                        # ripgrep reports byte offsets; the Python path reports characters
+                        column = len(line_bytes[:sub["start"]].decode('utf-8', errors='replace')) + 1
+                        file_matches.append((line_num, column, _rg_text(sub["match"])))
+
+            elif kind == "end":
+                filepath = _rg_text(data["path"])
+
+                for line_num, column, match_text in file_matches:
+                    if len(matches) >= LIMITS["max_results"]:
+                        break
+
+                    match_info = {
+                        "file": filepath,
+                        "line": line_num,
+                        "column": column,
+                        "text": file_lines[line_num],
+                        "match": match_text,
+                    }
+
+                    if context_lines > 0:
+                        context_before = [file_lines[n] for n in range(line_num - context_lines, line_num) if n in file_lines]
+                        context_after = [file_lines[n] for n in range(line_num + 1, line_num + context_lines + 1) if n in file_lines]
+                        if context_before:
+                            match_info["context_before"] = context_before
+                        if context_after:
+                            match_info["context_after"] = context_after
+
+                    matches.append(match_info)
+                    files_with_matches.add(filepath)
+
+                if len(matches) >= LIMITS["max_results"]:
+                    # Files after this one were never reached, as in the Python path
+                    files_searched = file_index.get(filepath, files_searched - 1) + 1
+                    break
+        else:
+            completed = True
+    finally:
+        # Stop rg once max_results is reached (or if parsing failed)
+        # (os.kill, not proc.kill: Popen.kill polls first and can reap the child
+        # behind asyncio's watcher, which then reports returncode 255)
+        if not completed and proc.returncode is None:
+            try:
+                os.kill(proc.pid, signal.SIGKILL)
+            except ProcessLookupError:
+                pass
+        await proc.wait()
+        await lone_cr_proc.wait()
+
+    # Exit code 1 means no lone CR was found; 0 (found) or 2 (error) fall back
+    if lone_cr_proc.returncode != 1:
+        return None
+
+    # Exit code 2 means an error; without any matches treat it as "rg could not run this search"
+    if proc.returncode == 2 and not matches:
+        return None
+
+    return {
+        "matches": matches,
+        "total_matches": len(matches),
+        "files_searched": files_searched,
+        "files_with_matches": len(files_with_matches),
+        "truncated": len(matches) >= LIMITS["max_results"],
+    }
 
 
 @server.call_tool()
@@ -205,10 +1006,10 @@ async def call_tool(name: str, arguments: dict):
             )
             return [TextContent(type="text", text=error_resp)]
 
-        # Compile regex
+        # Validate the regex up front; workers compile their own (cached) copy
         try:
             flags = 0 if case_sensitive else re.IGNORECASE
-            regex = re.compile(pattern, flags)
+            _search_regex(pattern, flags)
         except re.error as e:
             error_resp = create_response(
                 tool_name=name,
@@ -234,65 +1035,24 @@ async def call_tool(name: str, arguments: dict):
                     "files_searched": 0,
                     "truncated": False,
                 },
-                metadata={"limits": LIMITS}
+                metadata={"limits": LIMITS, "engine": "python"}
             )
             return [TextContent(type="text", text=response)]
 
-        matches = []
-        files_with_matches = set()
-        files_searched = 0
-
-        for filepath in files:
-            try:
-                # Check file size
-                size = os.path.getsize(filepath)
-                if size > LIMITS["max_file_size_bytes"]:
-                    continue
-
-                with open(filepath, 'r', encoding='utf-8', errors='replace') as f:
-                    lines = f.readlines()
-
-                files_searched += 1
-
-                for line_num, line in enumerate(lines, 1):
-                    for match in regex.finditer(line):
-                        if len(matches) >= LIMITS["max_results"]:
-                            break
-
-                        # Get context lines
-                        context_before = []
-                        context_after = []
-
-                        if context_lines > 0:
-                            start = max(0, line_num - 1 - context_lines)
-                            end = min(len(lines), line_num + context_lines)
-                            context_before = [l.rstrip('\n\r') for l in lines[start:line_num - 1]]
-                            context_after = [l.rstrip('\n\r') for l in lines[line_num:end]]
-
-                        match_info = {
-                            "file": filepath,
-                            "line": line_num,
-                            "column": match.start() + 1,
-                            "text": line.rstrip('\n\r'),
-                            "match": match.group(),
-                        }
-
-                        if context_before:
-                            match_info["context_before"] = context_before
-                        if context_after:
-                            match_info["context_after"] = context_after
-
-                        matches.append(match_info)
-                        files_with_matches.add(filepath)
-
-                    if len(matches) >= LIMITS["max_results"]:
-                        break
-
-            except Exception:
-                continue
-
-            if len(matches) >= LIMITS["max_results"]:
-                break
+        # Fast path: ripgrep scans the collected files natively
+        if RG_PATH and _rg_compatible(pattern, flags):
+            rg_data = await search_with_ripgrep(pattern, files, case_sensitive, context_lines)
+            if rg_data is not None:
+                response = create_response(
+                    tool_name=name,
+                    status="success",
+                    data=rg_data,
+                    metadata={"limits": LIMITS, "engine": "ripgrep"}
+                )
+                return [TextContent(type="text", text=response)]
+
+        files_searched, matches = await scan_files(_scan_file, files, pattern, flags, context_lines)
+        files_with_matches = {m["file"] for m in matches}
 
         response = create_response(
             tool_name=name,
@@ -304,7 +1064,7 @@ async def call_tool(name: str, arguments: dict):
                 "files_with_matches": len(files_with_matches),
                 "truncated": len(matches) >= LIMITS["max_results"],
             },
-            metadata={"limits": LIMITS}
+            metadata={"limits": LIMITS, "engine": "python"}
         )
         return [TextContent(type="text", text=response)]
 
@@ -327,51 +1087,10 @@ async def call_tool(name: str, arguments: dict):
             )
             return [TextContent(type="text", text=error_resp)]
 
-        # Patterns for Python imports
-        # import module, import module as alias
-        # from module import something
-        import_patterns = [
-            rf'\bimport\s+[\w,\s]*\b{re.escape(module)}\b',
-            rf'\bfrom\s+{re.escape(module)}(?:\.\w+)*\s+import\b',
-            rf'\bfrom\s+\w+(?:\.\w+)*\s+import\s+[\w,\s]*\b{re.escape(module)}\b',
-        ]
-
-        combined_pattern = '|'.join(import_patterns)
-        regex = re.compile(combined_pattern)
-
         # Only search Python files
         files = collect_files(path, ["*.py"], exclude)
 
-        imports = []
-        files_searched = 0
-
-        for filepath in files:
-            try:
-                size = os.path.getsize(filepath)
-                if size > LIMITS["max_file_size_bytes"]:
-                    continue
-
-                with open(filepath, 'r', encoding='utf-8', errors='replace') as f:
-                    lines = f.readlines()
-
-                files_searched += 1
-
-                for line_num, line in enumerate(lines, 1):
-                    if regex.search(line):
-                        if len(imports) >= LIMITS["max_results"]:
-                            break
-
-                        imports.append({
-                            "file": filepath,
-                            "line": line_num,
-                            "text": line.rstrip('\n\r'),
-                        })
-
-            except Exception:
-                continue
-
-            if len(imports) >= LIMITS["max_results"]:
-                break
+        files_searched, imports = await scan_files(_scan_imports, files, module)
 
         # Group by file
         by_file = {}
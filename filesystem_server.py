@@ -1,15 +1,25 @@
 import asyncio
 import os
+import stat
 import json
 import traceback
 import time
 import hashlib
 import tempfile
 import fnmatch
+import functools
+import re
 from mcp.server import Server
 from mcp.server.stdio import stdio_server
 from mcp.types import Tool, TextContent
 
+# Try to import orjson (faster response serialization, stdlib json otherwise)
+try:
+    import orjson
+    HAS_ORJSON = True
+except ImportError:
+    HAS_ORJSON = False
+
 server = Server("filesystem")
 
 # =============================================================================
@@ -22,9 +32,24 @@ LIMITS = {
     "timeout_seconds": 300,                     # 5 minute timeout for operations
 }
 
+HASH_CHUNK_SIZE = 1 << 20  # Read buffer for stat_files hashing
+STAT_CONCURRENCY = 32       # Max files stat_files works on at once
+WRITE_CONCURRENCY = 64      # Max files write_files works on at once
+
 # =============================================================================
 # FR-0.2: Common Response Schema
 # =============================================================================
+_TIMESTAMP = [0, ""]  # [second, formatted] of the last response
+
+
+def _timestamp() -> str:
+    """Current UTC time for responses, formatted at most once per second."""
+    now = int(time.time())
+    if now != _TIMESTAMP[0]:
+        _TIMESTAMP[:] = [now, time.strftime("%Y-%m-%dT%H:%M:%SZ", time.gmtime(now))]
+    return _TIMESTAMP[1]
+
+
 def create_response(
     tool_name: str,
     status: str,
@@ -36,7 +61,7 @@ def create_response(
     response = {
         "tool": tool_name,
         "status": status,
-        "timestamp": time.strftime("%Y-%m-%dT%H:%M:%SZ", time.gmtime()),
+        "timestamp": _timestamp(),
     }
 
     if data is not None:
@@ -48,20 +73,26 @@ def create_response(
     if metadata is not None:
         response["metadata"] = metadata
 
+    if HAS_ORJSON:
+        return orjson.dumps(
+            response, default=str, option=orjson.OPT_INDENT_2 | orjson.OPT_NON_STR_KEYS
+        ).decode()
     return json.dumps(response, indent=2, default=str)
 
 
 def error_response(tool_name: str, exception: Exception, context: str = None) -> str:
     """Create a standardized error response with full debugging info."""
-    tb_lines = traceback.format_exception(type(exception), exception, exception.__traceback__)
-    tb_snippet = ''.join(tb_lines[-3:]) if len(tb_lines) > 3 else ''.join(tb_lines)
-
     error_detail = {
         "type": type(exception).__name__,
         "message": str(exception),
-        "traceback_snippet": tb_snippet.strip(),
     }
 
+    # Formatting a traceback reads every frame's source file; only pay for it when debugging
+    if os.environ.get("MCP_DEBUG"):
+        tb_lines = traceback.format_exception(type(exception), exception, exception.__traceback__)
+        tb_snippet = ''.join(tb_lines[-3:]) if len(tb_lines) > 3 else ''.join(tb_lines)
+        error_detail["traceback_snippet"] = tb_snippet.strip()
+
     if context:
         error_detail["context"] = context
 
@@ -73,6 +104,125 @@ def error_response(tool_name: str, exception: Exception, context: str = None) ->
     )
 
 
+def sha256_file(path: str, size: int) -> str:
+    """Hash a file through one reusable buffer (no per-chunk allocations)."""
+    sha256 = hashlib.sha256()
+    buf = bytearray(max(1, min(size, HASH_CHUNK_SIZE)))
+    view = memoryview(buf)
+    with open(path, 'rb', buffering=0) as f:
+        while True:
+            n = f.readinto(buf)
+            if not n:
+                break
+            sha256.update(view[:n])
+    return sha256.hexdigest()
+
+
+def compile_globs(patterns: list):
+    """Compile glob patterns into one regex (None when there are no patterns)."""
+    if not patterns:
+        return None
+    return _compile_globs(tuple(patterns))
+
+
+@functools.lru_cache(maxsize=64)
+def _compile_globs(patterns: tuple) -> re.Pattern:
+    return re.compile('|'.join(fnmatch.translate(os.path.normcase(p)) for p in patterns))
+
+
+def walk_files(root: str, exclude_regex=None):
+    """Yield (dirpath, file entries) top-down like os.walk, skipping excluded directories.
+
+    Uses os.scandir so file types come from the directory listing instead of extra stats.
+    Symlinked directories are never entered (os.walk's followlinks=False).
+    """
+    stack = [root]
+    while stack:
+        dirpath = stack.pop()
+        try:
+            with os.scandir(dirpath) as it:
+                entries = list(it)
+        except OSError:
+            continue
+
+        file_entries = []
+        subdirs = []
+        for entry in entries:
+            try:
+                is_dir = entry.is_dir()
+            except OSError:
+                is_dir = False
+            if not is_dir:
+                file_entries.append(entry)
+            elif entry.is_dir(follow_symlinks=False):
+                if exclude_regex is None or not exclude_regex.match(os.path.normcase(entry.name)):
+                    subdirs.append(entry.path)
+
+        yield dirpath, file_entries
+        stack.extend(reversed(subdirs))
+
+
+def _write_one_atomic(path: str, content: str) -> tuple:
+    """Write one file atomically (temp file, then rename). Returns (result, error)."""
+    tmp_path = None
+    try:
+        dir_name = os.path.dirname(path) or '.'
+        with tempfile.NamedTemporaryFile(
+            mode='w',
+            encoding='utf-8',
+            dir=dir_name,
+            delete=False
+        ) as tmp:
+            tmp_path = tmp.name
+            tmp.write(content)
+
+        # Rename temp file to target (atomic on most systems)
+        os.replace(tmp_path, path)
+
+        return {"written": True, "size": len(content)}, None
+
+    except Exception as e:
+        # Clean up temp file if it exists
+        if tmp_path is not None and os.path.exists(tmp_path):
+            try:
+                os.unlink(tmp_path)
+            except OSError:
+                pass
+        return None, str(e)
+
+
+def _stat_one(path: str, include_hash: bool) -> tuple:
+    """Stat (and optionally hash) one path. Returns (file_info, error)."""
+    try:
+        # One stat call answers existence, type and size
+        try:
+            st = os.stat(path)
+        except (OSError, ValueError):
+            return None, "File not found"
+
+        is_file = stat.S_ISREG(st.st_mode)
+        file_info = {
+            "size": st.st_size,
+            "mtime": time.strftime("%Y-%m-%dT%H:%M:%SZ", time.gmtime(st.st_mtime)),
+            "ctime": time.strftime("%Y-%m-%dT%H:%M:%SZ", time.gmtime(st.st_ctime)),
+            "is_file": is_file,
+            "is_dir": stat.S_ISDIR(st.st_mode),
+        }
+
+        # Include hash if requested (and file isn't too large)
+        if include_hash and is_file:
+            if st.st_size <= LIMITS["max_file_size_bytes"]:
+                file_info["sha256"] = sha256_file(path, st.st_size)
+            else:
+                file_info["sha256"] = None
+                file_info["hash_skipped"] = "File too large"
+
+        return file_info, None
+
+    except Exception as e:
+        return None, str(e)
+
+
 @server.list_tools()
 async def list_tools():
     return [
@@ -182,28 +332,26 @@ async def call_tool(name: str, arguments: dict):
         files = []
         files_found = 0
 
-        for dirpath, dirnames, filenames in os.walk(root):
-            # Filter excluded directories
-            dirnames[:] = [d for d in dirnames if not any(
-                fnmatch.fnmatch(d, ex) for ex in exclude
-            )]
+        include_regex = compile_globs(patterns)
+        exclude_regex = compile_globs(exclude)
 
-            for filename in filenames:
+        for dirpath, file_entries in walk_files(root, exclude_regex):
+            for entry in file_entries:
                 # Check file count limit
                 if files_found >= LIMITS["max_files_per_operation"]:
                     break
 
+                filename = os.path.normcase(entry.name)
+
                 # Check if file matches patterns (if specified)
-                if patterns:
-                    if not any(fnmatch.fnmatch(filename, p) for p in patterns):
-                        continue
+                if include_regex is not None and not include_regex.match(filename):
+                    continue
 
                 # Check exclusions
-                if any(fnmatch.fnmatch(filename, ex) for ex in exclude):
+                if exclude_regex is not None and exclude_regex.match(filename):
                     continue
 
-                filepath = os.path.join(dirpath, filename)
-                rel_path = os.path.relpath(filepath, root)
+                rel_path = os.path.relpath(entry.path, root)
                 files.append(rel_path)
                 files_found += 1
 
@@ -247,17 +395,23 @@ async def call_tool(name: str, arguments: dict):
 
         for path in paths:
             try:
-                if not os.path.isfile(path):
+                # One stat call for the type and size checks (oversized files are never opened)
+                try:
+                    st = os.stat(path)
+                except (OSError, ValueError):
+                    st = None
+                if st is None or not stat.S_ISREG(st.st_mode):
                     errors[path] = "File not found"
                     continue
 
-                size = os.path.getsize(path)
+                size = st.st_size
                 if size > LIMITS["max_file_size_bytes"]:
                     errors[path] = f"File too large ({size:,} bytes, limit {LIMITS['max_file_size_bytes']:,})"
                     continue
 
                 with open(path, 'r', encoding='utf-8', errors='replace') as f:
-                    content = f.read()
+                    # Decode only up to the content limit (plus one char to detect truncation)
+                    content = f.read(LIMITS["max_content_length"] + 1)
 
                 # Truncate if too long
                 truncated = False
@@ -304,48 +458,51 @@ async def call_tool(name: str, arguments: dict):
             )
             return [TextContent(type="text", text=error_resp)]
 
-        results = {}
-        errors = {}
+        outcomes = {}
+        pending = {}
 
         for path, content in files.items():
             try:
                 # Check content length
                 if len(content) > LIMITS["max_content_length"]:
-                    errors[path] = f"Content too large ({len(content):,} chars, limit {LIMITS['max_content_length']:,})"
+                    outcomes[path] = (None, f"Content too large ({len(content):,} chars, limit {LIMITS['max_content_length']:,})")
                     continue
-
-                # Ensure parent directory exists
-                parent_dir = os.path.dirname(path)
-                if parent_dir and not os.path.exists(parent_dir):
+            except Exception as e:
+                outcomes[path] = (None, str(e))
+                continue
+            pending[path] = content
+
+        # Ensure each parent directory exists (once per directory, not per file)
+        parent_errors = {}
+        for parent_dir in {os.path.dirname(path) for path in pending}:
+            if parent_dir and not os.path.exists(parent_dir):
+                try:
                     os.makedirs(parent_dir, exist_ok=True)
+                except Exception as e:
+                    parent_errors[parent_dir] = str(e)
 
-                # Atomic write: write to temp file, then rename
-                dir_name = os.path.dirname(path) or '.'
-                with tempfile.NamedTemporaryFile(
-                    mode='w',
-                    encoding='utf-8',
-                    dir=dir_name,
-                    delete=False
-                ) as tmp:
-                    tmp.write(content)
-                    tmp_path = tmp.name
+        # Write in worker threads, bounded to limit open files
+        semaphore = asyncio.Semaphore(WRITE_CONCURRENCY)
 
-                # Rename temp file to target (atomic on most systems)
-                os.replace(tmp_path, path)
+        async def write_bounded(path, content):
+            parent_dir = os.path.dirname(path)
+            if parent_dir in parent_errors:
+                return None, parent_errors[parent_dir]
+            async with semaphore:
+                return await asyncio.to_thread(_write_one_atomic, path, content)
 
-                results[path] = {
-                    "written": True,
-                    "size": len(content),
-                }
+        written = await asyncio.gather(*(write_bounded(path, content) for path, content in pending.items()))
+        outcomes.update(zip(pending, written))
 
-            except Exception as e:
-                errors[path] = str(e)
-                # Clean up temp file if it exists
-                if 'tmp_path' in locals() and os.path.exists(tmp_path):
-                    try:
-                        os.unlink(tmp_path)
-                    except:
-                        pass
+        results = {}
+        errors = {}
+
+        for path in files:
+            result, error = outcomes[path]
+            if error is not None:
+                errors[path] = error
+            else:
+                results[path] = result
 
         response = create_response(
             tool_name=name,
@@ -378,42 +535,24 @@ async def call_tool(name: str, arguments: dict):
             )
             return [TextContent(type="text", text=error_resp)]
 
-        results = {}
-        errors = {}
+        # Stat/hash in worker threads (hashlib releases the GIL), bounded to limit open files
+        semaphore = asyncio.Semaphore(STAT_CONCURRENCY)
 
-        for path in paths:
-            try:
-                if not os.path.exists(path):
-                    errors[path] = "File not found"
-                    continue
-
-                stat = os.stat(path)
+        async def stat_bounded(path):
+            async with semaphore:
+                return await asyncio.to_thread(_stat_one, path, include_hash)
 
-                file_info = {
-                    "size": stat.st_size,
-                    "mtime": time.strftime("%Y-%m-%dT%H:%M:%SZ", time.gmtime(stat.st_mtime)),
-                    "ctime": time.strftime("%Y-%m-%dT%H:%M:%SZ", time.gmtime(stat.st_ctime)),
-                    "is_file": os.path.isfile(path),
-                    "is_dir": os.path.isdir(path),
-                }
+        outcomes = await asyncio.gather(*(stat_bounded(path) for path in paths))
 
-                # Include hash if requested (and file isn't too large)
-                if include_hash and os.path.isfile(path):
-                    if stat.st_size <= LIMITS["max_file_size_bytes"]:
-                        sha256 = hashlib.sha256()
-                        with open(path, 'rb') as f:
-                            for chunk in iter(lambda: f.read(8192), b''):
-                                sha256.update(chunk)
-                        file_info["sha256"] = sha256.hexdigest()
-                    else:
-                        file_info["sha256"] = None
-                        file_info["hash_skipped"] = "File too large"
+        results = {}
+        errors = {}
 
+        for path, (file_info, error) in zip(paths, outcomes):
+            if error is not None:
+                errors[path] = error
+            else:
                 results[path] = file_info
 
-            except Exception as e:
-                errors[path] = str(e)
-
         response = create_response(
             tool_name=name,
             status="success",
@@ -1,4 +1,5 @@
 import asyncio
+import operator
 from mcp.server import Server
 from mcp.server.stdio import stdio_server
 from mcp.types import Tool, TextContent, Resource
@@ -6,78 +7,93 @@ from mcp.types import Tool, TextContent, Resource
 # Initialize the server
 server = Server("my-first-mcp-server")
 
-# Define available tools
+# Define available tools (built once; list requests return the same objects)
+_TOOLS = [
+    Tool(
+        name="get_greeting",
+        description="Generate a personalized greeting",
+        inputSchema={
+            "type": "object",
+            "properties": {
+                "name": {
+                    "type": "string",
+                    "description": "Name of the person to greet"
+                }
+            },
+            "required": ["name"]
+        }
+    ),
+    Tool(
+        name="calculate",
+        description="Perform basic math operations",
+        inputSchema={
+            "type": "object",
+            "properties": {
+                "operation": {
+                    "type": "string",
+                    "enum": ["add", "subtract", "multiply", "divide"],
+                    "description": "Math operation to perform"
+                },
+                "a": {"type": "number", "description": "First number"},
+                "b": {"type": "number", "description": "Second number"}
+            },
+            "required": ["operation", "a", "b"]
+        }
+    )
+]
+
 @server.list_tools()
 async def list_tools():
-    return [
-        Tool(
-            name="get_greeting",
-            description="Generate a personalized greeting",
-            inputSchema={
-                "type": "object",
-                "properties": {
-                    "name": {
-                        "type": "string",
-                        "description": "Name of the person to greet"
-                    }
-                },
-                "required": ["name"]
-            }
-        ),
-        Tool(
-            name="calculate",
-            description="Perform basic math operations",
-            inputSchema={
-                "type": "object",
-                "properties": {
-                    "operation": {
-                        "type": "string",
-                        "enum": ["add", "subtract", "multiply", "divide"],
-                        "description": "Math operation to perform"
-                    },
-                    "a": {"type": "number", "description": "First number"},
-                    "b": {"type": "number", "description": "Second number"}
-                },
-                "required": ["operation", "a", "b"]
-            }
-        )
-    ]
+    return list(_TOOLS)
 
-# Handle tool calls
-@server.call_tool()
-async def call_tool(name: str, arguments: dict):
-    if name == "get_greeting":
-        person_name = arguments.get("name", "World")
-        return [TextContent(type="text", text=f"Hello, {person_name}! Welcome to MCP.")]
+# Math operations for the calculate tool
+def _divide(a, b):
+    return a / b if b != 0 else "Error: division by zero"
 
-    elif name == "calculate":
-        op = arguments["operation"]
-        a, b = arguments["a"], arguments["b"]
+_OPS = {
+    "add": operator.add,
+    "subtract": operator.sub,
+    "multiply": operator.mul,
+    "divide": _divide,
+}
 
-        if op == "add":
-            result = a + b
-        elif op == "subtract":
-            result = a - b
-        elif op == "multiply":
-            result = a * b
-        elif op == "divide":
-            result = a / b if b != 0 else "Error: division by zero"
+def _handle_greeting(arguments: dict):
+    person_name = arguments.get("name", "World")
+    return [TextContent(type="text", text="Hello, " + person_name + "! Welcome to MCP.")]
 
-        return [TextContent(type="text", text=f"Result: {result}")]
+def _handle_calculate(arguments: dict):
+    op = arguments["operation"]
+    a, b = arguments["a"], arguments["b"]
+    result = _OPS[op](a, b)
+    return [TextContent(type="text", text="Result: " + str(result))]
 
-    return [TextContent(type="text", text=f"Unknown tool: {name}")]
+_TOOL_HANDLERS = {
+    "get_greeting": _handle_greeting,
+    "calculate": _handle_calculate,
+}
+
+# Handle tool calls
+@server.call_tool()
+async def call_tool(name: str, arguments: dict):
+    handler = _TOOL_HANDLERS.get(name)
+    if handler is not None:
+        return handler(arguments)
+
+    return [TextContent(type="text", text="Unknown tool: " + name)]
 
 # Define available resources
+_RESOURCES = [
+    Resource(
+        uri="info://server-info",
+        name="Server Info",
+        description="Information about this MCP server",
+        mimeType="text/plain"
+    )
+]
+
 @server.list_resources()
 async def list_resources():
-    return [
-        Resource(
-            uri="info://server-info",
-            name="Server Info",
-            description="Information about this MCP server",
-            mimeType="text/plain"
-        )
-    ]
+    return list(_RESOURCES)
 
 @server.read_resource()
 async def read_resource(uri: str):
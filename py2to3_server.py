@@ -1,19 +1,51 @@
 import asyncio
 import ast
+import collections
+import functools
+import hashlib
 import re
+import sqlite3
+import stat
 import subprocess
 import tempfile
 import os
 import json
+import mmap
+import multiprocessing
 import traceback
 import time
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
 from mcp.server import Server
 from mcp.server.stdio import stdio_server
 from mcp.types import Tool, TextContent, Resource
 
+# Try to import orjson (faster response serialization, stdlib json otherwise)
+try:
+    import orjson
+    HAS_ORJSON = True
+except ImportError:
+    HAS_ORJSON = False
+
+# Try to import re2 (google-re2: matches the PY2 pattern table in one pass)
+try:
+    import re2
+    HAS_RE2 = True
+except ImportError:
+    HAS_RE2 = False
+
+# Try to import hyperscan (scans whole files against the PY2 pattern table at once)
+try:
+    import hyperscan
+    HAS_HYPERSCAN = True
+except ImportError:
+    HAS_HYPERSCAN = False
+
 # Try to import fissix (modern lib2to3 fork for Python 3.9+)
 try:
     from fissix import refactor
+    from fissix.pgen2.parse import ParseError
+    from fissix.pgen2.tokenize import TokenError
     HAS_FISSIX = True
 except ImportError:
     HAS_FISSIX = False
@@ -33,6 +65,17 @@ LIMITS = {
 # =============================================================================
 # FR-0.2: Common Response Schema
 # =============================================================================
+_TIMESTAMP = [0, ""]  # [second, formatted] of the last response
+
+
+def _timestamp() -> str:
+    """Current UTC time for responses, formatted at most once per second."""
+    now = int(time.time())
+    if now != _TIMESTAMP[0]:
+        _TIMESTAMP[:] = [now, time.strftime("%Y-%m-%dT%H:%M:%SZ", time.gmtime(now))]
+    return _TIMESTAMP[1]
+
+
 def create_response(
     tool_name: str,
     status: str,
@@ -56,7 +99,7 @@ def create_response(
     response = {
         "tool": tool_name,
         "status": status,
-        "timestamp": time.strftime("%Y-%m-%dT%H:%M:%SZ", time.gmtime()),
+        "timestamp": _timestamp(),
     }
 
     if data is not None:
@@ -68,7 +111,16 @@ def create_response(
     if metadata is not None:
         response["metadata"] = metadata
 
-    return json.dumps(response, indent=2, default=str)
+    return dump_json(response)
+
+
+def dump_json(obj) -> str:
+    """Serialize a response dict as indented JSON (orjson when installed)."""
+    if HAS_ORJSON:
+        return orjson.dumps(
+            obj, default=str, option=orjson.OPT_INDENT_2 | orjson.OPT_NON_STR_KEYS
+        ).decode()
+    return json.dumps(obj, indent=2, default=str)
 
 
 def error_response(tool_name: str, exception: Exception, context: str = None) -> str:
@@ -83,15 +135,17 @@ def error_response(tool_name: str, exception: Exception, context: str = None) ->
     Returns:
         JSON-formatted error response string
     """
-    tb_lines = traceback.format_exception(type(exception), exception, exception.__traceback__)
-    tb_snippet = ''.join(tb_lines[-3:]) if len(tb_lines) > 3 else ''.join(tb_lines)
-
     error_detail = {
         "type": type(exception).__name__,
         "message": str(exception),
-        "traceback_snippet": tb_snippet.strip(),
     }
 
+    # Formatting a traceback reads every frame's source file; only pay for it when debugging
+    if os.environ.get("MCP_DEBUG"):
+        tb_lines = traceback.format_exception(type(exception), exception, exception.__traceback__)
+        tb_snippet = ''.join(tb_lines[-3:]) if len(tb_lines) > 3 else ''.join(tb_lines)
+        error_detail["traceback_snippet"] = tb_snippet.strip()
+
     if context:
         error_detail["context"] = context
 
@@ -133,6 +187,62 @@ def check_file_size(filepath: str, tool_name: str) -> str:
     return None
 
 
+# Files at least this large are decoded straight from a memory map (mmap setup costs more below it)
+MMAP_MIN_SIZE = 64 * 1024
+
+
+def read_source(filepath: str, errors: str = 'strict') -> str:
+    """
+    Read a UTF-8 source file the way text-mode open() does (universal newlines).
+
+    Large files are decoded from a read-only memory map, so no intermediate bytes
+    copy of the whole file is made.
+
+    Returns:
+        The file contents as str
+    """
+    with open(filepath, 'rb') as f:
+        if os.fstat(f.fileno()).st_size >= MMAP_MIN_SIZE:
+            with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+                text = str(mm, 'utf-8', errors)
+        else:
+            text = str(f.read(), 'utf-8', errors)
+
+    if '\r' in text:
+        text = text.replace('\r\n', '\n').replace('\r', '\n')
+    return text
+
+
+# Sources convert_file wrote recently, with the file's (mtime_ns, size) right after the
+# write, so a validate_conversion or conversion_report that follows needn't read them back
+RECENT_SOURCE_CACHE_SIZE = 32
+_RECENT_SOURCES = collections.OrderedDict()
+
+
+def remember_source(filepath: str, code: str) -> None:
+    """Record code as the current contents of filepath, which was just written with it."""
+    try:
+        st = os.stat(filepath)
+    except OSError:
+        return
+    _RECENT_SOURCES[filepath] = (st.st_mtime_ns, st.st_size, code)
+    _RECENT_SOURCES.move_to_end(filepath)
+    if len(_RECENT_SOURCES) > RECENT_SOURCE_CACHE_SIZE:
+        _RECENT_SOURCES.popitem(last=False)
+
+
+def read_recent_source(filepath: str, errors: str = 'strict') -> str:
+    """read_source, served from remember_source while the file's mtime and size are unchanged."""
+    cached = _RECENT_SOURCES.get(filepath)
+    if cached is not None:
+        st = os.stat(filepath)
+        if (st.st_mtime_ns, st.st_size) == cached[:2]:
+            _RECENT_SOURCES.move_to_end(filepath)
+            return cached[2]
+        del _RECENT_SOURCES[filepath]
+    return read_source(filepath, errors)
+
+
 def check_code_length(code: str, tool_name: str) -> str:
     """
     Check if code input exceeds the length limit.
@@ -153,6 +263,35 @@ def check_code_length(code: str, tool_name: str) -> str:
         )
     return None
 
+# Syntax check results for recently parsed sources, keyed by a digest of the source
+SYNTAX_CACHE_SIZE = 256
+_SYNTAX_CACHE = collections.OrderedDict()
+
+
+def find_syntax_error(code: str) -> tuple:
+    """
+    Parse code with ast.parse, reusing the result for source seen recently.
+
+    Returns:
+        None if the code is valid, otherwise (lineno, msg, text) of the SyntaxError
+    """
+    key = hashlib.blake2b(code.encode('utf-8', 'surrogatepass'), digest_size=16).digest()
+    if key in _SYNTAX_CACHE:
+        _SYNTAX_CACHE.move_to_end(key)
+        return _SYNTAX_CACHE[key]
+
+    try:
+        ast.parse(code)
+        result = None
+    except SyntaxError as e:
+        # Keep the fields, not the exception (its traceback would pin frames)
+        result = (e.lineno, e.msg, e.text)
+
+    _SYNTAX_CACHE[key] = result
+    if len(_SYNTAX_CACHE) > SYNTAX_CACHE_SIZE:
+        _SYNTAX_CACHE.popitem(last=False)
+    return result
+
 # Python 2 patterns to detect (regex-based fallback + additional patterns)
 PY2_PATTERNS = {
     # Print and I/O
@@ -211,10 +350,796 @@ PY2_PATTERNS = {
     "httplib": r'\bhttplib\b',
 }
 
-def get_fissix_fixers():
-    """Get all available fissix fixers for comprehensive detection."""
-    if not HAS_FISSIX:
+# Text every match of a pattern contains, checked before running its regex
+# ("" where there is none: long literals are only digits plus l/L)
+PY2_LITERALS = {
+    "print_statement": "print",
+    "raw_input": "raw_input",
+    "execfile": "execfile",
+    "unicode_literal": "u",
+    "unicode_type": "unicode",
+    "basestring": "basestring",
+    "backticks": "`",
+    "long_suffix": "",
+    "old_octal": "0",
+    "xrange": "xrange",
+    "reduce": "reduce",
+    "apply": "apply",
+    "cmp_func": "cmp",
+    "coerce": "coerce",
+    "intern": "intern",
+    "file_builtin": "file",
+    "buffer_builtin": "buffer",
+    "iteritems": ".iteritems",
+    "iterkeys": ".iterkeys",
+    "itervalues": ".itervalues",
+    "has_key": ".has_key",
+    "viewitems": ".viewitems",
+    "viewkeys": ".viewkeys",
+    "viewvalues": ".viewvalues",
+    "old_ne": "<>",
+    "except_comma": "except",
+    "old_raise": "raise",
+    "old_repr": "`",
+    "configparser": "ConfigParser",
+    "queue_module": "Queue",
+    "urllib2": "urllib2",
+    "urlparse": "urlparse",
+    "stringio": "StringIO",
+    "cstringio": "cStringIO",
+    "cpickle": "cPickle",
+    "tkinter": "Tkinter",
+    "http_cookiejar": "cookielib",
+    "thread_module": "thread",
+    "commands_module": "commands",
+    "htmlparser": "HTMLParser",
+    "httplib": "httplib",
+}
+
+# An entry whose regex repeats an earlier one (old_repr is the same as backticks) is
+# only matched once, under the first name, and reported under both
+PY2_CANONICAL = {
+    name: next(first for first, other in PY2_PATTERNS.items() if other == pattern)
+    for name, pattern in PY2_PATTERNS.items()
+}
+
+# (name, literal, regex) for each distinct pattern in table order, compiled once;
+# re.search(str, ...) would look every pattern up in re's cache per line
+PY2_CHECKS = [
+    (name, PY2_LITERALS[name], re.compile(pattern))
+    for name, pattern in PY2_PATTERNS.items() if PY2_CANONICAL[name] == name
+]
+
+
+# Report categories for the PY2_PATTERNS names, and the reverse lookup used when
+# totalling per-file counts
+PY2_CATEGORIES = {
+    "Print/IO": ["print_statement", "raw_input", "execfile"],
+    "String/Unicode": ["unicode_literal", "unicode_type", "basestring", "backticks", "old_repr"],
+    "Numbers": ["long_suffix", "old_octal"],
+    "Builtins": ["xrange", "reduce", "apply", "cmp_func", "coerce", "intern", "file_builtin", "buffer_builtin"],
+    "Dict methods": ["iteritems", "iterkeys", "itervalues", "has_key", "viewitems", "viewkeys", "viewvalues"],
+    "Syntax": ["old_ne", "except_comma", "old_raise"],
+    "Imports": ["configparser", "queue_module", "urllib2", "urlparse", "stringio", "cstringio", "cpickle", "tkinter", "http_cookiejar", "thread_module", "commands_module", "htmlparser", "httplib"],
+}
+PATTERN_TO_CATEGORY = {
+    pattern: category for category, patterns in PY2_CATEGORIES.items() for pattern in patterns
+}
+
+
+def _py2_names(found: set) -> list:
+    """All PY2_PATTERNS names for a set of matched distinct patterns, in table order."""
+    if not found:
         return []
+    return [name for name in PY2_PATTERNS if PY2_CANONICAL[name] in found]
+
+
+def _re2_pattern(pattern: str):
+    """A re pattern in a form RE2 matches the same way on ASCII text, or None if it needs lookaround."""
+    # RE2 has no lookaround
+    if '(?<' in pattern or '(?=' in pattern or '(?!' in pattern:
+        return None
+    # RE2's \s is [\t\n\f\r ]; keep re's ASCII whitespace set
+    return pattern.replace(r'\s', r'[\t\n\v\f\r \x1c-\x1f]')
+
+
+def _build_py2_set():
+    """Compile the PY2_PATTERNS RE2 can handle into one set; the rest stay on re."""
+    if not HAS_RE2:
+        return None, [], PY2_CHECKS
+    pattern_set = re2.Set.SearchSet()
+    set_names, re_only = [], []
+    for name, literal, regex in PY2_CHECKS:
+        pattern = _re2_pattern(regex.pattern)
+        if pattern is None:
+            re_only.append((name, literal, regex))
+            continue
+        pattern_set.Add(pattern)
+        set_names.append(name)
+    pattern_set.Compile()
+    return pattern_set, set_names, re_only
+
+
+PY2_SET, PY2_SET_NAMES, PY2_RE_ONLY = _build_py2_set()
+
+
+def match_py2_patterns(line: str) -> list:
+    """Return the names of the PY2_PATTERNS found in a line, in table order."""
+    # RE2's \w, \d and \b are ASCII-only, so other lines go through re
+    if PY2_SET is None or not line.isascii():
+        return _py2_names({name for name, literal, regex in PY2_CHECKS
+                           if literal in line and regex.search(line)})
+    found = {PY2_SET_NAMES[index] for index in PY2_SET.Match(line) or ()}
+    found.update(name for name, literal, regex in PY2_RE_ONLY
+                 if literal in line and regex.search(line))
+    return _py2_names(found)
+
+
+
+# Lookaround-free equivalents for Hyperscan, which has no lookaround. Each first
+# character is a word character, so a leading (?<!\w) is just \b; for old_octal and
+# thread_module the trailing lookahead is implied by the \b. intern stays on re.
+_HS_REWRITES = {
+    "old_octal": r'\b0\d{2,}\b',
+    "reduce": r'(?:^|[^.\w])reduce\s*\(',
+    "apply": r'\bapply\s*\(',
+    "file_builtin": r'\bfile\s*\(',
+    "buffer_builtin": r'\bbuffer\s*\(',
+    "configparser": r'\bConfigParser\b',
+    "queue_module": r'\bQueue\b',
+    "stringio": r'\bStringIO\b',
+    "tkinter": r'\bTkinter\b',
+    "thread_module": r'\bthread\b',
+}
+
+
+@functools.lru_cache(maxsize=1)
+def _py2_hs_db():
+    """
+    Compile the PY2 patterns into one Hyperscan database for whole-file scans.
+
+    Built on first use (once per process): tool calls that never scan skip the compile.
+
+    Patterns are rewritten so that no match runs past the end of its line (and \\s keeps
+    re's ASCII whitespace set), so a match's end offset tells which line it is on.
+
+    Returns:
+        (database, names by id, re checks for the patterns left out), or None without hyperscan
+    """
+    if not HAS_HYPERSCAN:
+        return None
+    expressions, names, re_only = [], [], []
+    for name, literal, regex in PY2_CHECKS:
+        pattern = _HS_REWRITES.get(name, regex.pattern)
+        if '(?<' in pattern or '(?=' in pattern or '(?!' in pattern:
+            re_only.append((name, literal, regex))
+            continue
+        # (in Hyperscan \v is a class that includes \n, so vertical tab is spelled \x0b)
+        pattern = pattern.replace('[^', '[^\\n').replace(r'\s', r'[\t\x0b\f\r \x1c-\x1f]')
+        expressions.append(pattern.encode())
+        names.append(name)
+    database = hyperscan.Database()
+    database.compile(
+        expressions=expressions,
+        ids=list(range(len(expressions))),
+        elements=len(expressions),
+        flags=[hyperscan.HS_FLAG_MULTILINE] * len(expressions),
+    )
+    return database, names, re_only
+
+
+def _py2_hits_hs(code: str) -> dict:
+    """Line numbers matching each PY2_PATTERNS entry (by table index) of ASCII text, via Hyperscan."""
+    database, names, re_only = _py2_hs_db()
+    data = code.encode('ascii')
+    ends = []
+    database.scan(data, match_event_handler=lambda index, start, end, flags, context:
+                  ends.append((end, index)))
+    ends.sort()
+
+    skipped = {i for i, line in enumerate(code.split('\n', 2)[:2], 1)
+               if line.startswith('#!') or 'coding' in line}
+    hits = collections.defaultdict(set)  # table index -> line numbers
+    order = {name: index for index, name in enumerate(PY2_PATTERNS)}
+    lineno, pos = 1, 0
+    for end, index in ends:
+        # No match contains a newline, so everything before end decides the line
+        lineno += data.count(b'\n', pos, end)
+        pos = end
+        if lineno not in skipped:
+            hits[order[names[index]]].add(lineno)
+
+    for name, literal, regex in re_only:
+        if literal not in code:
+            continue
+        for i, line in enumerate(code.split('\n'), 1):
+            if i not in skipped and literal in line and regex.search(line):
+                hits[order[name]].add(i)
+
+    for name, first in PY2_CANONICAL.items():
+        if name != first and order[first] in hits:
+            hits[order[name]] = hits[order[first]]
+    return hits
+
+
+def _count_py2_patterns_hs(code: str) -> dict:
+    """count_py2_patterns for ASCII text, with one Hyperscan pass over the whole file."""
+    hits = _py2_hits_hs(code)
+    # Same key order as a line-by-line scan: by first line, then table order
+    found = sorted((min(lines), index) for index, lines in hits.items())
+    table = list(PY2_PATTERNS)
+    return {table[index]: len(hits[index]) for _, index in found}
+
+
+def count_py2_patterns(code: str) -> dict:
+    """Count the lines of a file matching each PY2 pattern, skipping shebang/encoding lines."""
+    if _py2_hs_db() is not None and code.isascii():
+        return _count_py2_patterns_hs(code)
+    if PY2_SET is not None:
+        match = match_py2_patterns
+    else:
+        # A pattern whose literal appears nowhere in the file can't match any of its lines
+        checks = [check for check in PY2_CHECKS if check[1] in code]
+        if not checks:
+            return {}
+
+        def match(line):
+            return _py2_names({name for name, literal, regex in checks
+                               if literal in line and regex.search(line)})
+
+    counts = {}
+    for i, line in enumerate(code.split('\n'), 1):
+        if i <= 2 and (line.startswith('#!') or 'coding' in line):
+            continue
+        for pattern_name in match(line):
+            counts[pattern_name] = counts.get(pattern_name, 0) + 1
+    return counts
+
+
+def py2_pattern_lines(code: str) -> dict:
+    """Map each line number with PY2 patterns to their names, skipping shebang/encoding lines."""
+    if _py2_hs_db() is not None and code.isascii():
+        # Only the lines Hyperscan reported are visited, not every line of the file
+        by_line = collections.defaultdict(list)
+        table = list(PY2_PATTERNS)
+        for index, lines in sorted(_py2_hits_hs(code).items()):
+            for lineno in lines:
+                by_line[lineno].append(table[index])
+        return dict(sorted(by_line.items()))
+
+    found = {}
+    for i, line in enumerate(code.split('\n'), 1):
+        if i <= 2 and (line.startswith('#!') or 'coding' in line):
+            continue
+        names = match_py2_patterns(line)
+        if names:
+            found[i] = names
+    return found
+
+
+# Patterns that require human judgment in converted code (validate_conversion)
+RUNTIME_PATTERNS = {
+    r'\bexec\s*\(': {
+        "issue": "exec() usage",
+        "reason": "Dynamic code execution may have different behavior in Python 3",
+        "severity": "high"
+    },
+    r'\beval\s*\(': {
+        "issue": "eval() usage",
+        "reason": "Dynamic evaluation may behave differently with string/bytes",
+        "severity": "medium"
+    },
+    r'(?<![/\d])/(?![/\d*])': {
+        "issue": "Division operator",
+        "reason": "Division returns float in Python 3 (was int in Python 2)",
+        "severity": "high"
+    },
+    r'\bopen\s*\([^)]+\)': {
+        "issue": "File operations",
+        "reason": "Default encoding changed; may need explicit encoding parameter",
+        "severity": "medium"
+    },
+    r'\.encode\s*\(|\.decode\s*\(': {
+        "issue": "String encoding/decoding",
+        "reason": "str/bytes handling changed significantly",
+        "severity": "medium"
+    },
+    r'\bpickle\b': {
+        "issue": "Pickle usage",
+        "reason": "Pickle protocol differences between Python 2/3",
+        "severity": "medium"
+    },
+    r'\bsocket\b': {
+        "issue": "Socket operations",
+        "reason": "Socket data is bytes in Python 3",
+        "severity": "medium"
+    },
+    r'\bsubprocess\b': {
+        "issue": "Subprocess calls",
+        "reason": "Output is bytes by default in Python 3",
+        "severity": "low"
+    },
+    r'sys\.std(in|out|err)': {
+        "issue": "Standard streams",
+        "reason": "Standard streams handle text differently in Python 3",
+        "severity": "low"
+    },
+    r'__metaclass__': {
+        "issue": "Old metaclass syntax",
+        "reason": "Use class Foo(metaclass=Meta) in Python 3",
+        "severity": "high"
+    },
+    r'\.sort\s*\([^)]*cmp\s*=': {
+        "issue": "sort() with cmp parameter",
+        "reason": "cmp parameter removed; use key with functools.cmp_to_key",
+        "severity": "high"
+    },
+}
+
+RUNTIME_REGEXES = [(re.compile(pattern), info) for pattern, info in RUNTIME_PATTERNS.items()]
+
+# FR-4.2: Issue classification with severity and categories (scan_compat)
+COMPAT_PATTERNS = {
+    # Deprecated functions (iterators)
+    "xrange": {
+        "pattern": r'\bxrange\s*\(',
+        "code": "PY2-ITER-001",
+        "message": "xrange() is not available in Python 3",
+        "suggested_fix": "Use range() instead",
+        "severity": "error",
+        "category": "iterators"
+    },
+    "iteritems": {
+        "pattern": r'\.iteritems\s*\(',
+        "code": "PY2-ITER-002",
+        "message": "dict.iteritems() is not available in Python 3",
+        "suggested_fix": "Use dict.items() instead",
+        "severity": "error",
+        "category": "iterators"
+    },
+    "itervalues": {
+        "pattern": r'\.itervalues\s*\(',
+        "code": "PY2-ITER-003",
+        "message": "dict.itervalues() is not available in Python 3",
+        "suggested_fix": "Use dict.values() instead",
+        "severity": "error",
+        "category": "iterators"
+    },
+    "iterkeys": {
+        "pattern": r'\.iterkeys\s*\(',
+        "code": "PY2-ITER-004",
+        "message": "dict.iterkeys() is not available in Python 3",
+        "suggested_fix": "Use dict.keys() instead",
+        "severity": "error",
+        "category": "iterators"
+    },
+    "has_key": {
+        "pattern": r'\.has_key\s*\(',
+        "code": "PY2-ITER-005",
+        "message": "dict.has_key() is not available in Python 3",
+        "suggested_fix": "Use 'key in dict' instead",
+        "severity": "error",
+        "category": "iterators"
+    },
+
+    # Obsolete type names (text-types)
+    "unicode_type": {
+        "pattern": r'\bunicode\s*\(',
+        "code": "PY2-TYPE-001",
+        "message": "unicode() is not available in Python 3",
+        "suggested_fix": "Use str() instead",
+        "severity": "error",
+        "category": "text-types"
+    },
+    "long_type": {
+        "pattern": r'(?:\d+|0[xX][0-9a-fA-F]+)[lL]\b',
+        "code": "PY2-TYPE-002",
+        "message": "Long integer suffix L is not valid in Python 3",
+        "suggested_fix": "Remove the L suffix",
+        "severity": "error",
+        "category": "text-types"
+    },
+    "basestring": {
+        "pattern": r'\bbasestring\b',
+        "code": "PY2-TYPE-003",
+        "message": "basestring is not available in Python 3",
+        "suggested_fix": "Use str instead",
+        "severity": "error",
+        "category": "text-types"
+    },
+    "unicode_literal": {
+        "pattern": r'\bu["\']',
+        "code": "PY2-TYPE-004",
+        "message": "Unicode literal prefix u'' is unnecessary in Python 3",
+        "suggested_fix": "Remove the u prefix (all strings are unicode in Python 3)",
+        "severity": "info",
+        "category": "text-types"
+    },
+
+    # Legacy operators
+    "old_ne": {
+        "pattern": r'<>',
+        "code": "PY2-OP-001",
+        "message": "<> comparison operator is not valid in Python 3",
+        "suggested_fix": "Use != instead",
+        "severity": "error",
+        "category": "operators"
+    },
+    "backticks": {
+        "pattern": r'`[^`]+`',
+        "code": "PY2-OP-002",
+        "message": "Backticks for repr are not valid in Python 3",
+        "suggested_fix": "Use repr() instead",
+        "severity": "error",
+        "category": "operators"
+    },
+
+    # Outdated syntax
+    "print_statement": {
+        "pattern": r'^[^#]*\bprint\s+[^(=]',
+        "code": "PY2-SYN-001",
+        "message": "Print statement syntax is not valid in Python 3",
+        "suggested_fix": "Use print() function instead",
+        "severity": "error",
+        "category": "syntax"
+    },
+    "except_comma": {
+        "pattern": r'except\s+[\w.]+\s*,\s*\w+',
+        "code": "PY2-SYN-002",
+        "message": "Old except syntax with comma is not valid in Python 3",
+        "suggested_fix": "Use 'except Exception as e:' instead",
+        "severity": "error",
+        "category": "syntax"
+    },
+    "old_raise": {
+        "pattern": r'raise\s+[\w.]+\s*,',
+        "code": "PY2-SYN-003",
+        "message": "Old raise syntax is not valid in Python 3",
+        "suggested_fix": "Use raise Exception('message') instead",
+        "severity": "error",
+        "category": "syntax"
+    },
+    "exec_statement": {
+        "pattern": r'^[^#]*\bexec\s+[^(]',
+        "code": "PY2-SYN-004",
+        "message": "exec statement syntax is not valid in Python 3",
+        "suggested_fix": "Use exec() function instead",
+        "severity": "error",
+        "category": "syntax"
+    },
+
+    # Relocated stdlib modules
+    "ConfigParser": {
+        "pattern": r'\bConfigParser\b',
+        "code": "PY2-LIB-001",
+        "message": "ConfigParser module was renamed in Python 3",
+        "suggested_fix": "Use 'import configparser' instead",
+        "severity": "error",
+        "category": "stdlib-move"
+    },
+    "StringIO": {
+        "pattern": r'\bStringIO(?:[^.\w]|$)',
+        "code": "PY2-LIB-002",
+        "message": "StringIO module was moved in Python 3",
+        "suggested_fix": "Use 'from io import StringIO' instead",
+        "severity": "error",
+        "category": "stdlib-move"
+    },
+    "cStringIO": {
+        "pattern": r'\bcStringIO\b',
+        "code": "PY2-LIB-003",
+        "message": "cStringIO is not available in Python 3",
+        "suggested_fix": "Use 'from io import StringIO' instead",
+        "severity": "error",
+        "category": "stdlib-move"
+    },
+    "cPickle": {
+        "pattern": r'\bcPickle\b',
+        "code": "PY2-LIB-004",
+        "message": "cPickle is not available in Python 3",
+        "suggested_fix": "Use 'import pickle' instead (it's fast in Python 3)",
+        "severity": "error",
+        "category": "stdlib-move"
+    },
+    "Queue": {
+        "pattern": r'\bQueue\b',
+        "code": "PY2-LIB-005",
+        "message": "Queue module was renamed in Python 3",
+        "suggested_fix": "Use 'import queue' instead",
+        "severity": "error",
+        "category": "stdlib-move"
+    },
+    "urllib2": {
+        "pattern": r'\burllib2\b',
+        "code": "PY2-LIB-006",
+        "message": "urllib2 is not available in Python 3",
+        "suggested_fix": "Use urllib.request and urllib.error instead",
+        "severity": "error",
+        "category": "stdlib-move"
+    },
+    "urlparse": {
+        "pattern": r'\burlparse\b',
+        "code": "PY2-LIB-007",
+        "message": "urlparse module was moved in Python 3",
+        "suggested_fix": "Use urllib.parse instead",
+        "severity": "error",
+        "category": "stdlib-move"
+    },
+    "httplib": {
+        "pattern": r'\bhttplib\b',
+        "code": "PY2-LIB-008",
+        "message": "httplib was renamed in Python 3",
+        "suggested_fix": "Use http.client instead",
+        "severity": "error",
+        "category": "stdlib-move"
+    },
+    "HTMLParser": {
+        "pattern": r'\bHTMLParser\b',
+        "code": "PY2-LIB-009",
+        "message": "HTMLParser module was moved in Python 3",
+        "suggested_fix": "Use html.parser instead",
+        "severity": "error",
+        "category": "stdlib-move"
+    },
+
+    # Other deprecated builtins
+    "raw_input": {
+        "pattern": r'\braw_input\s*\(',
+        "code": "PY2-BUILTIN-001",
+        "message": "raw_input() is not available in Python 3",
+        "suggested_fix": "Use input() instead",
+        "severity": "error",
+        "category": "builtins"
+    },
+    "execfile": {
+        "pattern": r'\bexecfile\s*\(',
+        "code": "PY2-BUILTIN-002",
+        "message": "execfile() is not available in Python 3",
+        "suggested_fix": "Use exec(open(file).read()) instead",
+        "severity": "error",
+        "category": "builtins"
+    },
+    "reduce": {
+        "pattern": r'(?:^|[^.\w])reduce\s*\(',
+        "code": "PY2-BUILTIN-003",
+        "message": "reduce() was moved to functools in Python 3",
+        "suggested_fix": "Use 'from functools import reduce'",
+        "severity": "warning",
+        "category": "builtins"
+    },
+    "apply": {
+        "pattern": r'\bapply\s*\(',
+        "code": "PY2-BUILTIN-004",
+        "message": "apply() is not available in Python 3",
+        "suggested_fix": "Use func(*args, **kwargs) instead",
+        "severity": "error",
+        "category": "builtins"
+    },
+    "file_builtin": {
+        "pattern": r'\bfile\s*\(',
+        "code": "PY2-BUILTIN-005",
+        "message": "file() builtin is not available in Python 3",
+        "suggested_fix": "Use open() instead",
+        "severity": "error",
+        "category": "builtins"
+    },
+    "cmp_func": {
+        "pattern": r'\bcmp\s*\(',
+        "code": "PY2-BUILTIN-006",
+        "message": "cmp() is not available in Python 3",
+        "suggested_fix": "Use (a > b) - (a < b) or functools.cmp_to_key",
+        "severity": "error",
+        "category": "builtins"
+    },
+}
+
+# Text every match of a COMPAT pattern contains, checked before running its regex
+# (as PY2_LITERALS does for PY2_PATTERNS)
+COMPAT_LITERALS = {
+    "xrange": "xrange",
+    "iteritems": ".iteritems",
+    "itervalues": ".itervalues",
+    "iterkeys": ".iterkeys",
+    "has_key": ".has_key",
+    "unicode_type": "unicode",
+    "long_type": "",
+    "basestring": "basestring",
+    "unicode_literal": "u",
+    "old_ne": "<>",
+    "backticks": "`",
+    "print_statement": "print",
+    "except_comma": "except",
+    "old_raise": "raise",
+    "exec_statement": "exec",
+    "ConfigParser": "ConfigParser",
+    "StringIO": "StringIO",
+    "cStringIO": "cStringIO",
+    "cPickle": "cPickle",
+    "Queue": "Queue",
+    "urllib2": "urllib2",
+    "urlparse": "urlparse",
+    "httplib": "httplib",
+    "HTMLParser": "HTMLParser",
+    "raw_input": "raw_input",
+    "execfile": "execfile",
+    "reduce": "reduce",
+    "apply": "apply",
+    "file_builtin": "file",
+    "cmp_func": "cmp",
+}
+
+# (literal, regex, info) for each COMPAT_PATTERNS entry in table order, compiled once
+COMPAT_CHECKS = [
+    (COMPAT_LITERALS[name], re.compile(info["pattern"]), info)
+    for name, info in COMPAT_PATTERNS.items()
+]
+
+
+def _build_compat_set():
+    """
+    Compile the COMPAT_PATTERNS RE2 can handle into one set, so an ASCII line is
+    matched in one pass; a pattern needing lookaround would stay on re.
+
+    Returns:
+        (set or None without re2, COMPAT_CHECKS index per set entry, indexes left to re)
+    """
+    if not HAS_RE2:
+        return None, [], list(range(len(COMPAT_CHECKS)))
+    pattern_set = re2.Set.SearchSet()
+    set_indexes, re_only = [], []
+    for index, (literal, regex, info) in enumerate(COMPAT_CHECKS):
+        pattern = _re2_pattern(regex.pattern)
+        if pattern is None:
+            re_only.append(index)
+            continue
+        pattern_set.Add(pattern)
+        set_indexes.append(index)
+    pattern_set.Compile()
+    return pattern_set, set_indexes, re_only
+
+
+COMPAT_SET, COMPAT_SET_INDEXES, COMPAT_RE_ONLY = _build_compat_set()
+
+
+def match_compat_patterns(line: str, checks: list = COMPAT_CHECKS, re_only: list = COMPAT_RE_ONLY) -> list:
+    """
+    Return the COMPAT_PATTERNS entries found in a line, in table order.
+
+    checks and re_only can be narrowed to the entries whose literal is in the file.
+    """
+    # RE2's \w, \d and \b are ASCII-only, so other lines go through re
+    if COMPAT_SET is None or not line.isascii():
+        return [info for literal, regex, info in checks
+                if literal in line and regex.search(line)]
+    found = {COMPAT_SET_INDEXES[index] for index in COMPAT_SET.Match(line) or ()}
+    for index in re_only:
+        literal, regex, info = COMPAT_CHECKS[index]
+        if literal in line and regex.search(line):
+            found.add(index)
+    return [COMPAT_CHECKS[index][2] for index in sorted(found)]
+
+
+@functools.lru_cache(maxsize=1)
+def _compat_hs_db():
+    """
+    Compile the COMPAT patterns into one Hyperscan database for whole-file scans.
+
+    Built on first use, like _py2_hs_db(). As there, patterns are kept within a line,
+    except that a negated class ending a pattern (print/exec statements) may still
+    match the line's own newline, as it does on a readlines() line. So the last
+    character of a match tells its line.
+
+    Returns:
+        (database, COMPAT_CHECKS index by id, indexes left to re), or None without hyperscan
+    """
+    if not HAS_HYPERSCAN:
+        return None
+    expressions, indexes, re_only = [], [], []
+    for index, (literal, regex, info) in enumerate(COMPAT_CHECKS):
+        pattern = regex.pattern
+        if '(?<' in pattern or '(?=' in pattern or '(?!' in pattern:
+            re_only.append(index)
+            continue
+        last = ''
+        if pattern.endswith(']'):
+            cut = pattern.rindex('[')
+            pattern, last = pattern[:cut], pattern[cut:]
+        pattern = pattern.replace('[^', '[^\\n').replace(r'\s', r'[\t\x0b\f\r \x1c-\x1f]') + last
+        expressions.append(pattern.encode())
+        indexes.append(index)
+    database = hyperscan.Database()
+    database.compile(
+        expressions=expressions,
+        ids=list(range(len(expressions))),
+        elements=len(expressions),
+        flags=[hyperscan.HS_FLAG_MULTILINE] * len(expressions),
+    )
+    return database, indexes, re_only
+
+
+def _compat_lines_hs(text: str) -> dict:
+    """compat_pattern_lines for ASCII text, with one Hyperscan pass over the whole file."""
+    database, indexes, re_only = _compat_hs_db()
+    data = text.encode('ascii')
+    ends = []
+    database.scan(data, match_event_handler=lambda index, start, end, flags, context:
+                  ends.append((end, index)))
+    ends.sort()
+
+    skipped = {i for i, line in enumerate(text.split('\n', 2)[:2], 1)
+               if line.startswith('#!') or 'coding' in line}
+    hits = collections.defaultdict(set)  # line number -> COMPAT_CHECKS indexes
+    lineno, pos = 1, 0
+    for end, index in ends:
+        # Only a match's last character can be a newline (its line's own)
+        lineno += data.count(b'\n', pos, end - 1)
+        pos = end - 1
+        if lineno not in skipped:
+            hits[lineno].add(indexes[index])
+
+    lines = None
+    for index in re_only:
+        literal, regex, info = COMPAT_CHECKS[index]
+        if literal not in text:
+            continue
+        if lines is None:
+            lines = _readlines(text)
+        for i, line in enumerate(lines, 1):
+            if i not in skipped and literal in line and regex.search(line):
+                hits[i].add(index)
+
+    return {i: [COMPAT_CHECKS[index][2] for index in sorted(hits[i])] for i in sorted(hits)}
+
+
+def _readlines(text: str) -> list:
+    """text split the way readlines() splits a file, each line keeping its newline."""
+    lines = text.split('\n')
+    last = lines.pop()
+    lines = [line + '\n' for line in lines]
+    if last:
+        lines.append(last)
+    return lines
+
+
+def compat_pattern_lines(text: str) -> dict:
+    """Map each line number with COMPAT patterns to their entries, skipping shebang/encoding lines."""
+    if _compat_hs_db() is not None and text.isascii():
+        return _compat_lines_hs(text)
+
+    # A pattern whose literal appears nowhere in the file can't match any of its lines
+    checks = [check for check in COMPAT_CHECKS if check[0] in text]
+    re_only = [index for index in COMPAT_RE_ONLY if COMPAT_CHECKS[index][0] in text]
+
+    found = {}
+    for i, line in enumerate(_readlines(text), 1):
+        if i <= 2 and (line.startswith('#!') or 'coding' in line):
+            continue
+        infos = match_compat_patterns(line, checks, re_only)
+        if infos:
+            found[i] = infos
+    return found
+
+
+# Print statements (not already a function call), one per line: [^\S\n] keeps the
+# whitespace runs from reaching into the next line
+PRINT_STATEMENT_RE = re.compile(r'^([^\S\n]*)print[^\S\n]+(?!\()(.*?)([^\S\n]*#.*)?$', re.MULTILINE)
+
+
+def _print_function(match) -> str:
+    """re.sub replacement rewriting a PRINT_STATEMENT_RE match as a print() call."""
+    indent, content, comment = match.group(1), match.group(2).rstrip(), match.group(3) or ''
+
+    # Handle trailing comma (no newline)
+    if content.endswith(','):
+        return f"{indent}print({content[:-1]}, end=' '){comment}"
+    return f"{indent}print({content}){comment}"
+
+
+@functools.lru_cache(maxsize=1)
+def get_fissix_fixers() -> frozenset:
+    """Get all available fissix fixers for comprehensive detection (listed once per process)."""
+    if not HAS_FISSIX:
+        return frozenset()
 
     from fissix import fixes
     import pkgutil
@@ -223,9 +1148,440 @@ def get_fissix_fixers():
     for importer, modname, ispkg in pkgutil.iter_modules(fixes.__path__):
         if modname.startswith('fix_'):
             fixer_names.append(f'fissix.fixes.{modname}')
-    return fixer_names
+    return frozenset(fixer_names)
+
+
+# RefactoringTool construction imports and compiles every fixer; build each configuration once
+_RT_CACHE = {}
+
+
+def _get_rt(fixers: frozenset, print_function: bool = False):
+    """Get a shared RefactoringTool for a set of fixers and options."""
+    key = (fixers, print_function)
+    rt = _RT_CACHE.get(key)
+    if rt is None:
+        rt = refactor.RefactoringTool(sorted(fixers), options={'print_function': print_function})
+        _RT_CACHE[key] = rt
+    return rt
+
+
+def _refactor_string(rt, code: str, name: str) -> tuple:
+    """Refactor code with a shared RefactoringTool, leaving no per-call state behind.
+
+    Returns (tree, fixer messages).
+    """
+    try:
+        return rt.refactor_string(code, name), list(rt.fixer_log)
+    finally:
+        # Fixers append their warnings to the tool's log; a shared tool would keep them forever
+        del rt.fixer_log[:]
+
+
+def convert_source(code: str, name: str) -> tuple:
+    """Run every fissix fixer over source code. Returns (converted code, fixer messages)."""
+    rt = _get_rt(get_fissix_fixers())
+    tree, messages = _refactor_string(rt, code + '\n', name)
+    # Drop the newline added for the parser
+    return str(tree)[:-1], messages
+
+
+# Conversions run in worker processes: fissix is pure-Python CPU work that would
+# otherwise block the event loop. "spawn" avoids forking the threaded event loop.
+_PROC_POOL = None  # Created on first use by _get_proc_pool()
+SCAN_BATCH_SIZE = 32  # Files per directory scan worker task
+
+
+def _warm_worker():
+    """Build the worker's RefactoringTool up front so its first conversion doesn't pay for it."""
+    _get_rt(get_fissix_fixers())
+
+
+def _get_proc_pool() -> ProcessPoolExecutor:
+    """Get the conversion worker pool, starting it on first use."""
+    global _PROC_POOL
+    if _PROC_POOL is None:
+        _PROC_POOL = ProcessPoolExecutor(
+            max_workers=os.cpu_count(),
+            mp_context=multiprocessing.get_context("spawn"),
+            initializer=_warm_worker,
+        )
+    return _PROC_POOL
+
+
+def _discard_proc_pool(pool: ProcessPoolExecutor):
+    """Drop a broken worker pool so the next call starts a fresh one."""
+    global _PROC_POOL
+    if _PROC_POOL is pool:
+        _PROC_POOL = None
+    pool.shutdown(wait=False)
+
+
+async def run_convert_source(code: str, name: str) -> tuple:
+    """
+    Convert source code in the worker pool, bounded by LIMITS["timeout_seconds"].
+
+    Raises:
+        asyncio.TimeoutError: if the conversion takes longer than the limit
+    """
+    pool = _get_proc_pool()
+    loop = asyncio.get_running_loop()
+    try:
+        return await asyncio.wait_for(
+            loop.run_in_executor(pool, convert_source, code, name),
+            LIMITS["timeout_seconds"],
+        )
+    except BrokenProcessPool:
+        # A worker died: replace the pool for later calls and convert this one here
+        _discard_proc_pool(pool)
+        return convert_source(code, name)
+
+
+def _scan_file(filepath: str, reading=None):
+    """
+    Scan a file for PY2 patterns: (issue counts, line count), or an error string if it can't be read.
+
+    reading, if given, is a future already reading the file with read_source.
+    """
+    try:
+        code = reading.result() if reading is not None else read_source(filepath, errors='ignore')
+        return count_py2_patterns(code), code.count('\n') + 1
+    except Exception as e:
+        return f"Error: {str(e)}"
+
+
+def _scan_batch(filepaths: list) -> list:
+    """Worker task: _scan_file for each file, in order, reading the next file while scanning one."""
+    if len(filepaths) < 2:
+        return [_scan_file(filepath) for filepath in filepaths]
+
+    outcomes = []
+    # File reads release the GIL, so one reader thread overlaps I/O with the regex work
+    with ThreadPoolExecutor(max_workers=1) as reader:
+        reading = reader.submit(read_source, filepaths[0], 'ignore')
+        for index, filepath in enumerate(filepaths):
+            current = reading
+            if index + 1 < len(filepaths):
+                reading = reader.submit(read_source, filepaths[index + 1], 'ignore')
+            outcomes.append(_scan_file(filepath, current))
+    return outcomes
+
+
+def _compat_read_error(filepath: str, e: Exception) -> dict:
+    """scan_compat's SCAN-ERR-003 issue for a file that failed to read or scan."""
+    return {
+        "file": filepath,
+        "line": 0,
+        "code": "SCAN-ERR-003",
+        "message": f"Error reading file: {str(e)}",
+        "severity": "error",
+        "category": "scan-error"
+    }
+
+
+def _compat_load(filepath: str) -> tuple:
+    """
+    Check and read one file for scan_compat.
+
+    Returns:
+        (the file's text, None), or (None, a scan-error issue) if it can't be scanned
+    """
+    # One stat answers both the existence and the size check
+    try:
+        st = os.stat(filepath)
+    except OSError:
+        st = None
+    if st is None or not stat.S_ISREG(st.st_mode):
+        return None, {
+            "file": filepath,
+            "line": 0,
+            "code": "SCAN-ERR-001",
+            "message": f"File not found: {filepath}",
+            "severity": "error",
+            "category": "scan-error"
+        }
+
+    # Check file size
+    if st.st_size > LIMITS["max_file_size_bytes"]:
+        return None, {
+            "file": filepath,
+            "line": 0,
+            "code": "SCAN-ERR-002",
+            "message": f"File exceeds size limit ({LIMITS['max_file_size_bytes']} bytes)",
+            "severity": "warning",
+            "category": "scan-error"
+        }
+
+    try:
+        return read_source(filepath, errors='replace'), None
+    except Exception as e:
+        return None, _compat_read_error(filepath, e)
+
+
+def _compat_scan_file(filepath: str, loading=None) -> tuple:
+    """
+    scan_compat's check of one file.
+
+    Hits are (line number, COMPAT_PATTERNS entry, stripped source line) tuples; the
+    handler turns them into issue dicts, so workers send back much less to pickle.
+    loading, if given, is a future already running _compat_load on the file.
+
+    Returns:
+        (whether the file was scanned, its hits, a scan-error issue or None)
+    """
+    text, scan_error = loading.result() if loading is not None else _compat_load(filepath)
+    if text is None:
+        return False, [], scan_error
+
+    hits = []
+    try:
+        lines = text.split('\n')
+        for line_num, infos in compat_pattern_lines(text).items():
+            # Strip each line once, however many patterns it matches
+            source = lines[line_num - 1].strip()
+            hits.extend((line_num, pattern_info, source) for pattern_info in infos)
+    except Exception as e:
+        return True, hits, _compat_read_error(filepath, e)
+    return True, hits, None
+
+
+def _compat_scan_batch(filepaths: list, stop_at_hit: bool = False) -> list:
+    """
+    Worker task: _compat_scan_file for each file, in order, loading the next file while scanning one.
+
+    With stop_at_hit the batch ends after the first file with hits, so the outcomes
+    may cover only a prefix of filepaths.
+    """
+    if len(filepaths) < 2:
+        return [_compat_scan_file(filepath) for filepath in filepaths]
+
+    outcomes = []
+    # Same look-ahead as _scan_batch: the reader thread stats and reads file N+1
+    with ThreadPoolExecutor(max_workers=1) as reader:
+        loading = reader.submit(_compat_load, filepaths[0])
+        for index, filepath in enumerate(filepaths):
+            current = loading
+            if index + 1 < len(filepaths):
+                loading = reader.submit(_compat_load, filepaths[index + 1])
+            outcomes.append(_compat_scan_file(filepath, current))
+            if stop_at_hit and outcomes[-1][1]:
+                break
+    return outcomes
+
+
+async def run_scan_batches(filepaths: list, scan_batch=_scan_batch, stop_when=None) -> list:
+    """
+    Run a batch scanner (_scan_batch by default) over files, in order, fanning batches out to the worker pool.
+
+    stop_when, if given, is called with each batch's outcomes as they come back in
+    order; once it returns true, the batches not yet started are cancelled and only
+    the outcomes so far are returned.
+    """
+    batches = [filepaths[i:i + SCAN_BATCH_SIZE] for i in range(0, len(filepaths), SCAN_BATCH_SIZE)]
+    if len(batches) <= 1:
+        # Not worth the round trip to the pool
+        return scan_batch(filepaths)
+
+    pool = _get_proc_pool()
+    loop = asyncio.get_running_loop()
+    futures = []
+    try:
+        for batch in batches:
+            futures.append(loop.run_in_executor(pool, scan_batch, batch))
+    except BrokenProcessPool:
+        # The pool broke before this call: replace it and scan everything here
+        for future in futures:
+            future.cancel()
+        _discard_proc_pool(pool)
+        return scan_batch(filepaths)
+
+    outcomes = []
+    for index, (batch, future) in enumerate(zip(batches, futures)):
+        try:
+            batch_outcomes = await future
+        except BrokenProcessPool:
+            # A worker died: replace the pool for later calls and scan this batch here
+            _discard_proc_pool(pool)
+            batch_outcomes = scan_batch(batch)
+        outcomes.extend(batch_outcomes)
+        if stop_when is not None and stop_when(batch_outcomes):
+            for later in futures[index + 1:]:
+                later.cancel()
+            break
+    return outcomes
+
+
+# =============================================================================
+# Scan cache: per-file PY2 pattern counts, kept across runs
+# =============================================================================
+SCAN_CACHE_PATH = os.path.join(os.path.expanduser("~"), ".cache", "py2to3mcp", "scan_cache.sqlite3")
+
+# Cached counts are only valid for the pattern table they were made with
+_PATTERNS_HASH = hashlib.sha256(repr(sorted(PY2_PATTERNS.items())).encode()).hexdigest()
+
+_SCAN_CACHE = None  # sqlite3 connection, opened by _get_scan_cache(); False if unavailable
+
+
+def _get_scan_cache():
+    """Open the scan cache on first use, or return None if it can't be opened."""
+    global _SCAN_CACHE
+    if _SCAN_CACHE is None:
+        try:
+            os.makedirs(os.path.dirname(SCAN_CACHE_PATH), exist_ok=True)
+            conn = sqlite3.connect(SCAN_CACHE_PATH, timeout=5)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute(
+                "CREATE TABLE IF NOT EXISTS files ("
+                "path TEXT PRIMARY KEY, mtime_ns INTEGER, size INTEGER, issues TEXT, lines INTEGER)"
+            )
+            conn.execute("CREATE TABLE IF NOT EXISTS meta (key TEXT PRIMARY KEY, value TEXT)")
+            row = conn.execute("SELECT value FROM meta WHERE key = 'patterns_hash'").fetchone()
+            if row is None or row[0] != _PATTERNS_HASH:
+                with conn:
+                    conn.execute("DELETE FROM files")
+                    conn.execute("INSERT OR REPLACE INTO meta VALUES ('patterns_hash', ?)", (_PATTERNS_HASH,))
+            _SCAN_CACHE = conn
+        except (sqlite3.Error, OSError):
+            _SCAN_CACHE = False
+    return _SCAN_CACHE or None
+
+
+def _cache_get(cache, filepath: str, st: os.stat_result):
+    """Look up a file's cached scan, valid only if its mtime and size are unchanged."""
+    try:
+        row = cache.execute(
+            "SELECT issues, lines FROM files WHERE path = ? AND mtime_ns = ? AND size = ?",
+            (os.path.abspath(filepath), st.st_mtime_ns, st.st_size),
+        ).fetchone()
+    except sqlite3.Error:
+        return None
+    if row is None:
+        return None
+    return json.loads(row[0]), row[1]
+
+
+def _cache_put(cache, scanned: list):
+    """Store (filepath, stat, (issues, lines)) scans, replacing older entries for those paths."""
+    try:
+        with cache:
+            cache.executemany(
+                "INSERT OR REPLACE INTO files VALUES (?, ?, ?, ?, ?)",
+                [
+                    (os.path.abspath(filepath), st.st_mtime_ns, st.st_size, json.dumps(issues), lines)
+                    for filepath, st, (issues, lines) in scanned
+                ],
+            )
+    except sqlite3.Error:
+        pass
+
+
+def _exclude_suffixes(exclude: list) -> tuple:
+    """
+    Directory-name suffixes for an exclude list, for one str.endswith call per directory.
+
+    An entry matches a directory by name or, as "*suffix", by suffix; since a name
+    always ends with itself, both come down to endswith with the '*' stripped.
+    """
+    return tuple(ex.lstrip('*') for ex in exclude)
+
+
+def _walk_py_files(top: str, excluded: tuple):
+    """
+    Yield os.DirEntry objects for the .py files under top, in os.walk order.
+
+    Like os.walk, directories whose name ends with one of excluded (see
+    _exclude_suffixes) and symlinked directories are not entered. Walking with
+    scandir keeps each entry's cached stat data (free on Windows) for the size check.
+    """
+    try:
+        with os.scandir(top) as it:
+            entries = list(it)
+    except OSError:
+        return
+
+    subdirs = []
+    for entry in entries:
+        try:
+            is_dir = entry.is_dir()
+        except OSError:
+            is_dir = False
+
+        if not is_dir:
+            if entry.name.endswith('.py'):
+                yield entry
+        elif not entry.name.endswith(excluded):
+            if not entry.is_symlink():
+                subdirs.append(entry.path)
+
+    for subdir in subdirs:
+        yield from _walk_py_files(subdir, excluded)
+
+
+async def scan_py_files(path: str, exclude: list) -> tuple:
+    """
+    Scan every .py file under path for PY2 patterns, in os.walk order.
+
+    Unchanged files are answered from the scan cache; the rest are scanned in the
+    worker pool. Only files read successfully count toward max_files_per_operation.
+
+    Returns:
+        (entries, files_scanned, skipped_files) where entries are (rel_path, outcome)
+        for the files within the limit; outcome is (issue counts, line count), an
+        error string, or None for a file over the size limit (or that can't be stat'ed)
+    """
+    max_files = LIMITS["max_files_per_operation"]
+
+    # (rel_path, filepath, stat), stat None when the file is too large
+    found = []
+    for entry in _walk_py_files(path, _exclude_suffixes(exclude)):
+        try:
+            st = entry.stat()
+            if st.st_size > LIMITS["max_file_size_bytes"]:
+                st = None
+        except OSError:
+            st = None
+        found.append((os.path.relpath(entry.path, path), entry.path, st))
+
+    cache = _get_scan_cache()
+    outcomes = {}
+    files_scanned = 0
+    cutoff = len(found) if max_files > 0 else 0
+    to_scan = [i for i, entry in enumerate(found) if entry[2] is not None]
+    # Hand out at most the remaining quota per round, so files that fail to read
+    # leave room for the next ones
+    while to_scan and files_scanned < max_files:
+        batch = to_scan[:max_files - files_scanned]
+        del to_scan[:len(batch)]
+
+        misses = []
+        for i in batch:
+            hit = _cache_get(cache, found[i][1], found[i][2]) if cache else None
+            if hit is None:
+                misses.append(i)
+            else:
+                outcomes[i] = hit
+        scanned = []
+        for i, outcome in zip(misses, await run_scan_batches([found[i][1] for i in misses])):
+            outcomes[i] = outcome
+            if not isinstance(outcome, str):
+                scanned.append((found[i][1], found[i][2], outcome))
+        if cache and scanned:
+            _cache_put(cache, scanned)
+
+        for i in batch:
+            if not isinstance(outcomes[i], str):
+                files_scanned += 1
+                if files_scanned == max_files:
+                    cutoff = i + 1
 
-def analyze_with_fissix(code):
+    entries = [
+        (rel_path, outcomes.get(i) if st is not None else None)
+        for i, (rel_path, _, st) in enumerate(found[:cutoff])
+    ]
+    skipped_files = [filepath for _, filepath, _ in found[cutoff:]]
+    return entries, files_scanned, skipped_files
+
+
+def analyze_with_fissix(code: str) -> list:
     """Use fissix to analyze code and find Python 2 patterns."""
     if not HAS_FISSIX:
         return []
@@ -236,10 +1592,10 @@ def analyze_with_fissix(code):
     fixers = get_fissix_fixers()
 
     try:
-        rt = refactor.RefactoringTool(fixers, options={'print_function': False})
+        rt = _get_rt(fixers)
 
         # Parse the code
-        tree = rt.refactor_string(code + '\n', '<input>')
+        tree, _ = _refactor_string(rt, code + '\n', '<input>')
 
         # The refactoring tool will have applied fixes - we can compare
         # original vs refactored to find issues
@@ -269,6 +1625,12 @@ def analyze_with_fissix(code):
 
     return issues
 
+@functools.lru_cache(maxsize=128)
+def _const_reply(text: str) -> tuple:
+    """Build the content for a fixed reply once; returned as a tuple so it can't be mutated."""
+    return (TextContent(type="text", text=text),)
+
+
 @server.list_tools()
 async def list_tools():
     return [
@@ -444,6 +1806,11 @@ async def list_tools():
                         "type": "array",
                         "items": {"type": "string"},
                         "description": "List of file paths to analyze"
+                    },
+                    "mode": {
+                        "type": "string",
+                        "enum": ["full", "any"],
+                        "description": "'full' reports every issue; 'any' stops at the first file with an issue and reports only its first issue (default: full)"
                     }
                 },
                 "required": ["files"]
@@ -532,41 +1899,26 @@ async def call_tool(name: str, arguments: dict):
         }
 
         # Regex-based pattern matching
-        for i, line in enumerate(lines, 1):
-            # Skip shebang and encoding lines
-            if i <= 2 and (line.startswith('#!') or 'coding' in line):
-                continue
+        for i, pattern_names in py2_pattern_lines(code).items():
+            line = lines[i - 1]
+            for pattern_name in pattern_names:
+                # Track count
+                issue_counts[pattern_name] = issue_counts.get(pattern_name, 0) + 1
 
-            for pattern_name, pattern in PY2_PATTERNS.items():
-                if re.search(pattern, line):
-                    # Track count
-                    issue_counts[pattern_name] = issue_counts.get(pattern_name, 0) + 1
+                issue_desc = issue_descriptions.get(pattern_name, pattern_name)
+                issues.append(f"Line {i}: {issue_desc}")
+                issues.append(f"  → {line.strip()}")
 
-                    issue_desc = issue_descriptions.get(pattern_name, pattern_name)
-                    issues.append(f"Line {i}: {issue_desc}")
-                    issues.append(f"  → {line.strip()}")
-
-                    # Show fissix conversion if available
-                    if i in fissix_conversions:
-                        issues.append(f"  ✓ {fissix_conversions[i].strip()}")
+                # Show fissix conversion if available
+                if i in fissix_conversions:
+                    issues.append(f"  ✓ {fissix_conversions[i].strip()}")
 
         if not issues:
-            return [TextContent(type="text", text="No Python 2 patterns detected. Code appears Python 3 compatible.")]
+            return list(_const_reply("No Python 2 patterns detected. Code appears Python 3 compatible."))
 
         # Build summary statistics
         total = len([x for x in issues if x.startswith('Line ')])
 
-        # Group counts by category
-        categories = {
-            "Print/IO": ["print_statement", "raw_input", "execfile"],
-            "String/Unicode": ["unicode_literal", "unicode_type", "basestring", "backticks", "old_repr"],
-            "Numbers": ["long_suffix", "old_octal"],
-            "Builtins": ["xrange", "reduce", "apply", "cmp_func", "coerce", "intern", "file_builtin", "buffer_builtin"],
-            "Dict methods": ["iteritems", "iterkeys", "itervalues", "has_key", "viewitems", "viewkeys", "viewvalues"],
-            "Syntax": ["old_ne", "except_comma", "old_raise"],
-            "Imports": ["configparser", "queue_module", "urllib2", "urlparse", "stringio", "cstringio", "cpickle", "tkinter", "http_cookiejar", "thread_module", "commands_module", "htmlparser", "httplib"],
-        }
-
         summary = f"## Analysis Summary\n\n**Total issues found: {total}**\n"
         if HAS_FISSIX:
             summary += "*Analysis powered by fissix*\n\n"
@@ -575,7 +1927,7 @@ async def call_tool(name: str, arguments: dict):
 
         summary += "### By Category:\n"
 
-        for cat_name, patterns in categories.items():
+        for cat_name, patterns in PY2_CATEGORIES.items():
             cat_count = sum(issue_counts.get(p, 0) for p in patterns)
             if cat_count > 0:
                 summary += f"- **{cat_name}**: {cat_count}\n"
@@ -592,43 +1944,44 @@ async def call_tool(name: str, arguments: dict):
     elif name == "run_2to3":
         code = arguments.get("code", "")
 
-        with tempfile.NamedTemporaryFile(mode='w', suffix='.py', delete=False) as f:
-            f.write(code)
-            temp_path = f.name
-
+        # Only the system 2to3 fallback needs the code on disk
+        temp_path = None
         try:
             if HAS_FISSIX:
-                # Use fissix (modern lib2to3 fork, Python 3.9+ compatible)
-                from fissix import main as fissix_main
-                import sys
-                from io import StringIO
+                # Use fissix (modern lib2to3 fork, Python 3.9+ compatible) in-process,
+                # through the cached RefactoringTool in the worker pool
+                import difflib
 
-                # Capture output
-                old_stdout = sys.stdout
-                old_stderr = sys.stderr
-                sys.stdout = StringIO()
-                sys.stderr = StringIO()
+                # Read the way 2to3 reads a file: universal newlines, BOM kept out of the parse
+                source = code.replace('\r\n', '\n').replace('\r', '\n')
+                bom = ''
+                if source.startswith('\ufeff'):
+                    bom, source = '\ufeff', source[1:]
 
                 try:
-                    # Run fissix refactoring
-                    fissix_main.main("fissix.fixes", args=['-w', '-n', temp_path])
-                    stdout_val = sys.stdout.getvalue()
-                    stderr_val = sys.stderr.getvalue()
-                except SystemExit:
-                    stdout_val = sys.stdout.getvalue()
-                    stderr_val = sys.stderr.getvalue()
-                finally:
-                    sys.stdout = old_stdout
-                    sys.stderr = old_stderr
-
-                # Read converted file
-                with open(temp_path, 'r') as f:
-                    converted = f.read()
+                    converted, messages = await run_convert_source(source, '<input>')
+                    if messages:
+                        messages.insert(0, "Warnings/messages while refactoring:")
+                except (ParseError, TokenError, SyntaxError) as e:
+                    # Unparseable input is reported, not raised, as the 2to3 command line does
+                    converted = source
+                    messages = [f"Can't parse <input>: {type(e).__name__}: {e}"]
+
+                diff = difflib.unified_diff(
+                    source.splitlines(), converted.splitlines(),
+                    "<input>", "<input>", "(original)", "(refactored)", lineterm=""
+                )
+                stdout_val = "".join(line + "\n" for line in diff)
+                stderr_val = "".join(f"RefactoringTool: {message}\n" for message in messages)
 
                 output = f"=== fissix Output (Python 3.9+ compatible) ===\n{stdout_val}\n{stderr_val}\n\n"
-                output += f"=== Converted Code ===\n{converted}"
+                output += f"=== Converted Code ===\n{bom}{converted}"
             else:
                 # Fall back to system 2to3
+                with tempfile.NamedTemporaryFile(mode='w', suffix='.py', delete=False) as f:
+                    f.write(code)
+                    temp_path = f.name
+
                 result = subprocess.run(
                     ['2to3', '-w', '-n', temp_path],
                     capture_output=True,
@@ -643,11 +1996,14 @@ async def call_tool(name: str, arguments: dict):
 
             return [TextContent(type="text", text=output)]
         except FileNotFoundError:
-            return [TextContent(type="text", text="Error: Neither fissix nor 2to3 found. Install fissix: pip install fissix")]
+            return list(_const_reply("Error: Neither fissix nor 2to3 found. Install fissix: pip install fissix"))
+        except asyncio.TimeoutError:
+            return [TextContent(type="text", text=f"Error during conversion: took longer than {LIMITS['timeout_seconds']} seconds")]
         except Exception as e:
             return [TextContent(type="text", text=f"Error during conversion: {str(e)}")]
         finally:
-            os.unlink(temp_path)
+            if temp_path is not None:
+                os.unlink(temp_path)
 
     elif name == "convert_print_statements":
         code = arguments.get("code", "")
@@ -656,37 +2012,17 @@ async def call_tool(name: str, arguments: dict):
         # Handles: print "text" → print("text")
         #          print x, y → print(x, y)
 
-        lines = code.split('\n')
-        converted = []
-
-        for line in lines:
-            # Match print statement (not already a function call)
-            match = re.match(r'^(\s*)print\s+(?!\()(.*?)(\s*#.*)?$', line)
-            if match:
-                indent = match.group(1)
-                content = match.group(2).rstrip()
-                comment = match.group(3) or ''
-
-                # Handle trailing comma (no newline)
-                if content.endswith(','):
-                    content = content[:-1]
-                    converted.append(f"{indent}print({content}, end=' '){comment}")
-                else:
-                    converted.append(f"{indent}print({content}){comment}")
-            else:
-                converted.append(line)
-
-        result = '\n'.join(converted)
+        result = PRINT_STATEMENT_RE.sub(_print_function, code)
         return [TextContent(type="text", text=result)]
 
     elif name == "check_syntax":
         code = arguments.get("code", "")
 
-        try:
-            ast.parse(code)
-            return [TextContent(type="text", text="✓ Valid Python 3 syntax")]
-        except SyntaxError as e:
-            return [TextContent(type="text", text=f"✗ Syntax error at line {e.lineno}: {e.msg}\n  {e.text}")]
+        syntax_error = find_syntax_error(code)
+        if syntax_error is None:
+            return list(_const_reply("✓ Valid Python 3 syntax"))
+        lineno, msg, text = syntax_error
+        return [TextContent(type="text", text=f"✗ Syntax error at line {lineno}: {msg}\n  {text}")]
 
     elif name == "get_migration_guide":
         issue = arguments.get("issue", "").lower()
@@ -809,10 +2145,10 @@ Use `six` or `future` libraries for compatibility.
         }
 
         if issue in guides:
-            return [TextContent(type="text", text=guides[issue])]
+            return list(_const_reply(guides[issue]))
         else:
             available = ", ".join(guides.keys())
-            return [TextContent(type="text", text=f"Unknown issue type. Available guides: {available}")]
+            return list(_const_reply(f"Unknown issue type. Available guides: {available}"))
 
     elif name == "analyze_directory":
         path = arguments.get("path", "")
@@ -833,57 +2169,20 @@ Use `six` or `future` libraries for compatibility.
         results = []
         total_issues = 0
         files_with_issues = 0
-        files_scanned = 0
-        skipped_files = []
-
-        for root, dirs, files in os.walk(path):
-            # Filter excluded directories
-            dirs[:] = [d for d in dirs if not any(
-                d == ex or d.endswith(ex.lstrip('*')) for ex in exclude
-            )]
-
-            for file in files:
-                if not file.endswith('.py'):
-                    continue
-
-                # FR-0.3: Check file count limit
-                if files_scanned >= LIMITS["max_files_per_operation"]:
-                    skipped_files.append(os.path.join(root, file))
-                    continue
 
-                filepath = os.path.join(root, file)
-                rel_path = os.path.relpath(filepath, path)
-
-                # FR-0.3: Check file size limit
-                size_error = check_file_size(filepath, name)
-                if size_error:
-                    results.append((rel_path, "Skipped: file too large"))
-                    continue
-
-                try:
-                    with open(filepath, 'r', encoding='utf-8', errors='ignore') as f:
-                        code = f.read()
-
-                    # Count issues in this file
-                    file_issues = 0
-                    lines = code.split('\n')
-
-                    for i, line in enumerate(lines, 1):
-                        if i <= 2 and (line.startswith('#!') or 'coding' in line):
-                            continue
-                        for pattern in PY2_PATTERNS.values():
-                            if re.search(pattern, line):
-                                file_issues += 1
-
-                    if file_issues > 0:
-                        results.append((rel_path, file_issues))
-                        total_issues += file_issues
-                        files_with_issues += 1
-
-                    files_scanned += 1
-
-                except Exception as e:
-                    results.append((rel_path, f"Error: {str(e)}"))
+        # FR-0.3: Files over the size or count limits are reported, not scanned
+        entries, files_scanned, skipped_files = await scan_py_files(path, exclude)
+        for rel_path, outcome in entries:
+            if outcome is None:
+                results.append((rel_path, "Skipped: file too large"))
+            elif isinstance(outcome, str):
+                results.append((rel_path, outcome))
+            else:
+                file_issues = sum(outcome[0].values())
+                if file_issues > 0:
+                    results.append((rel_path, file_issues))
+                    total_issues += file_issues
+                    files_with_issues += 1
 
         # Sort by issue count descending
         results.sort(key=lambda x: x[1] if isinstance(x[1], int) else 0, reverse=True)
@@ -955,8 +2254,7 @@ Use `six` or `future` libraries for compatibility.
             return [TextContent(type="text", text=size_error)]
 
         try:
-            with open(file_path, 'r', encoding='utf-8') as f:
-                original_code = f.read()
+            original_code = read_source(file_path)
 
             if not HAS_FISSIX:
                 error_resp = create_response(
@@ -970,10 +2268,21 @@ Use `six` or `future` libraries for compatibility.
                 return [TextContent(type="text", text=error_resp)]
 
             # Use fissix to convert
-            fixers = get_fissix_fixers()
-            rt = refactor.RefactoringTool(fixers, options={'print_function': False})
-            tree = rt.refactor_string(original_code + '\n', file_path)
-            converted_code = str(tree).rstrip('\n')
+            try:
+                converted_code, _ = await run_convert_source(original_code, file_path)
+                converted_code = converted_code.rstrip('\n')
+            except asyncio.TimeoutError:
+                error_resp = create_response(
+                    tool_name=name,
+                    status="error",
+                    error={
+                        "type": "TimeoutExceeded",
+                        "message": f"Conversion took longer than {LIMITS['timeout_seconds']} seconds",
+                        "file": file_path,
+                        "limit_seconds": LIMITS["timeout_seconds"],
+                    }
+                )
+                return [TextContent(type="text", text=error_resp)]
 
             if converted_code == original_code:
                 response = create_response(
@@ -1024,6 +2333,7 @@ Use `six` or `future` libraries for compatibility.
             # Write converted file
             with open(file_path, 'w', encoding='utf-8') as f:
                 f.write(converted_code)
+            remember_source(file_path, converted_code)
 
             # Count changes
             orig_lines = original_code.split('\n')
@@ -1064,77 +2374,28 @@ Use `six` or `future` libraries for compatibility.
         file_data = []
         total_issues = 0
         category_totals = {}
-        files_scanned = 0
-        skipped_files = []
-
-        categories = {
-            "Print/IO": ["print_statement", "raw_input", "execfile"],
-            "String/Unicode": ["unicode_literal", "unicode_type", "basestring", "backticks", "old_repr"],
-            "Numbers": ["long_suffix", "old_octal"],
-            "Builtins": ["xrange", "reduce", "apply", "cmp_func", "coerce", "intern", "file_builtin", "buffer_builtin"],
-            "Dict methods": ["iteritems", "iterkeys", "itervalues", "has_key", "viewitems", "viewkeys", "viewvalues"],
-            "Syntax": ["old_ne", "except_comma", "old_raise"],
-            "Imports": ["configparser", "queue_module", "urllib2", "urlparse", "stringio", "cstringio", "cpickle", "tkinter", "http_cookiejar", "thread_module", "commands_module", "htmlparser", "httplib"],
-        }
-
-        for root, dirs, files in os.walk(path):
-            dirs[:] = [d for d in dirs if not any(
-                d == ex or d.endswith(ex.lstrip('*')) for ex in exclude
-            )]
 
-            for file in files:
-                if not file.endswith('.py'):
-                    continue
-
-                # FR-0.3: Check file count limit
-                if files_scanned >= LIMITS["max_files_per_operation"]:
-                    skipped_files.append(os.path.join(root, file))
-                    continue
-
-                filepath = os.path.join(root, file)
-                rel_path = os.path.relpath(filepath, path)
-
-                # FR-0.3: Check file size limit
-                try:
-                    if os.path.getsize(filepath) > LIMITS["max_file_size_bytes"]:
-                        continue  # Skip large files silently in report
-                except OSError:
-                    continue
-
-                try:
-                    with open(filepath, 'r', encoding='utf-8', errors='ignore') as f:
-                        code = f.read()
-
-                    file_issues = {}
-                    lines = code.split('\n')
-
-                    for i, line in enumerate(lines, 1):
-                        if i <= 2 and (line.startswith('#!') or 'coding' in line):
-                            continue
-                        for pattern_name, pattern in PY2_PATTERNS.items():
-                            if re.search(pattern, line):
-                                file_issues[pattern_name] = file_issues.get(pattern_name, 0) + 1
-
-                    if file_issues:
-                        issue_count = sum(file_issues.values())
-                        file_data.append({
-                            'path': rel_path,
-                            'issues': file_issues,
-                            'total': issue_count,
-                            'lines': len(lines)
-                        })
-                        total_issues += issue_count
-
-                        for pattern, count in file_issues.items():
-                            for cat, patterns in categories.items():
-                                if pattern in patterns:
-                                    category_totals[cat] = category_totals.get(cat, 0) + count
-                                    break
-
-                    files_scanned += 1
+        # FR-0.3: Files over the size limit or that can't be read are left out of the report
+        entries, files_scanned, skipped_files = await scan_py_files(path, exclude)
+        for rel_path, outcome in entries:
+            if outcome is None or isinstance(outcome, str):
+                continue
+            file_issues, line_count = outcome
+
+            if file_issues:
+                issue_count = sum(file_issues.values())
+                file_data.append({
+                    'path': rel_path,
+                    'issues': file_issues,
+                    'total': issue_count,
+                    'lines': line_count
+                })
+                total_issues += issue_count
 
-                except Exception:
-                    pass
+                for pattern, count in file_issues.items():
+                    cat = PATTERN_TO_CATEGORY.get(pattern)
+                    if cat is not None:
+                        category_totals[cat] = category_totals.get(cat, 0) + count
 
         # Sort by total issues descending
         file_data.sort(key=lambda x: x['total'], reverse=True)
@@ -1226,101 +2487,40 @@ Use `six` or `future` libraries for compatibility.
             return [TextContent(type="text", text=size_error)]
 
         try:
-            with open(file_path, 'r', encoding='utf-8') as f:
-                code = f.read()
+            code = read_recent_source(file_path)
 
             # 1. Syntax check
             syntax_valid = True
             syntax_error = None
-            try:
-                ast.parse(code)
-            except SyntaxError as e:
+            error_info = find_syntax_error(code)
+            if error_info is not None:
+                lineno, msg, text = error_info
                 syntax_valid = False
                 syntax_error = {
-                    "line": e.lineno,
-                    "message": e.msg,
-                    "text": e.text.strip() if e.text else ""
+                    "line": lineno,
+                    "message": msg,
+                    "text": text.strip() if text else ""
                 }
 
             # 2. Check for remaining Python 2 patterns
             remaining_patterns = []
             lines = code.split('\n')
-            for i, line in enumerate(lines, 1):
-                if i <= 2 and (line.startswith('#!') or 'coding' in line):
-                    continue
-                for pattern_name, pattern in PY2_PATTERNS.items():
-                    if re.search(pattern, line):
-                        remaining_patterns.append({
-                            "line": i,
-                            "pattern": pattern_name,
-                            "text": line.strip()
-                        })
+            for i, pattern_names in py2_pattern_lines(code).items():
+                line = lines[i - 1]
+                for pattern_name in pattern_names:
+                    remaining_patterns.append({
+                        "line": i,
+                        "pattern": pattern_name,
+                        "text": line.strip()
+                    })
 
             # 3. Identify runtime-only issues needing human review
             needs_human_review = []
 
-            # Patterns that require human judgment
-            runtime_patterns = {
-                r'\bexec\s*\(': {
-                    "issue": "exec() usage",
-                    "reason": "Dynamic code execution may have different behavior in Python 3",
-                    "severity": "high"
-                },
-                r'\beval\s*\(': {
-                    "issue": "eval() usage",
-                    "reason": "Dynamic evaluation may behave differently with string/bytes",
-                    "severity": "medium"
-                },
-                r'(?<![/\d])/(?![/\d*])': {
-                    "issue": "Division operator",
-                    "reason": "Division returns float in Python 3 (was int in Python 2)",
-                    "severity": "high"
-                },
-                r'\bopen\s*\([^)]+\)': {
-                    "issue": "File operations",
-                    "reason": "Default encoding changed; may need explicit encoding parameter",
-                    "severity": "medium"
-                },
-                r'\.encode\s*\(|\.decode\s*\(': {
-                    "issue": "String encoding/decoding",
-                    "reason": "str/bytes handling changed significantly",
-                    "severity": "medium"
-                },
-                r'\bpickle\b': {
-                    "issue": "Pickle usage",
-                    "reason": "Pickle protocol differences between Python 2/3",
-                    "severity": "medium"
-                },
-                r'\bsocket\b': {
-                    "issue": "Socket operations",
-                    "reason": "Socket data is bytes in Python 3",
-                    "severity": "medium"
-                },
-                r'\bsubprocess\b': {
-                    "issue": "Subprocess calls",
-                    "reason": "Output is bytes by default in Python 3",
-                    "severity": "low"
-                },
-                r'sys\.std(in|out|err)': {
-                    "issue": "Standard streams",
-                    "reason": "Standard streams handle text differently in Python 3",
-                    "severity": "low"
-                },
-                r'__metaclass__': {
-                    "issue": "Old metaclass syntax",
-                    "reason": "Use class Foo(metaclass=Meta) in Python 3",
-                    "severity": "high"
-                },
-                r'\.sort\s*\([^)]*cmp\s*=': {
-                    "issue": "sort() with cmp parameter",
-                    "reason": "cmp parameter removed; use key with functools.cmp_to_key",
-                    "severity": "high"
-                },
-            }
 
             for i, line in enumerate(lines, 1):
-                for pattern, info in runtime_patterns.items():
-                    if re.search(pattern, line):
+                for regex, info in RUNTIME_REGEXES:
+                    if regex.search(line):
                         needs_human_review.append({
                             "line": i,
                             "issue": info["issue"],
@@ -1399,32 +2599,25 @@ Use `six` or `future` libraries for compatibility.
                 )
                 return [TextContent(type="text", text=error_resp)]
 
+        # FR-0.3: Check file size limits before reading either file
+        for path in (original_path, converted_path):
+            size_error = check_file_size(path, name)
+            if size_error:
+                return [TextContent(type="text", text=size_error)]
+
         try:
-            with open(original_path, 'r', encoding='utf-8', errors='replace') as f:
-                original_code = f.read()
-            with open(converted_path, 'r', encoding='utf-8', errors='replace') as f:
-                converted_code = f.read()
+            original_code = read_source(original_path, errors='replace')
+            converted_code = read_recent_source(converted_path, errors='replace')
 
-            orig_lines = original_code.split('\n')
-            conv_lines = converted_code.split('\n')
+            # Identical files (e.g. a conversion that changed nothing) need no second
+            # scan and have an empty diff
+            identical = original_code == converted_code
 
             # 1. Count original issues
-            original_issues = {}
-            for i, line in enumerate(orig_lines, 1):
-                if i <= 2 and (line.startswith('#!') or 'coding' in line):
-                    continue
-                for pattern_name, pattern in PY2_PATTERNS.items():
-                    if re.search(pattern, line):
-                        original_issues[pattern_name] = original_issues.get(pattern_name, 0) + 1
+            original_issues = count_py2_patterns(original_code)
 
             # 2. Count remaining issues in converted
-            remaining_issues = {}
-            for i, line in enumerate(conv_lines, 1):
-                if i <= 2 and (line.startswith('#!') or 'coding' in line):
-                    continue
-                for pattern_name, pattern in PY2_PATTERNS.items():
-                    if re.search(pattern, line):
-                        remaining_issues[pattern_name] = remaining_issues.get(pattern_name, 0) + 1
+            remaining_issues = original_issues if identical else count_py2_patterns(converted_code)
 
             # 3. Calculate what was fixed
             fixed_issues = {}
@@ -1434,25 +2627,25 @@ Use `six` or `future` libraries for compatibility.
                     fixed_issues[pattern] = count - remaining
 
             # 4. Generate diff summary
-            import difflib
-            differ = difflib.unified_diff(
-                orig_lines,
-                conv_lines,
-                fromfile=original_path,
-                tofile=converted_path,
-                lineterm=''
-            )
-            diff_lines = list(differ)
+            if identical:
+                additions = deletions = 0
+            else:
+                import difflib
+                orig_lines = original_code.split('\n')
+                conv_lines = converted_code.split('\n')
 
-            additions = len([line for line in diff_lines if line.startswith('+') and not line.startswith('+++')])
-            deletions = len([line for line in diff_lines if line.startswith('-') and not line.startswith('---')])
+                # Only the counts are reported, so take them from the matcher's opcodes
+                # rather than formatting a unified diff. Lines starting '--'/'++' are left
+                # out, as they were when the diff's '---'/'+++' headers were skipped.
+                additions = deletions = 0
+                matcher = difflib.SequenceMatcher(None, orig_lines, conv_lines)
+                for tag, i1, i2, j1, j2 in matcher.get_opcodes():
+                    if tag != 'equal':
+                        deletions += sum(1 for line in orig_lines[i1:i2] if not line.startswith('--'))
+                        additions += sum(1 for line in conv_lines[j1:j2] if not line.startswith('++'))
 
             # 5. Check syntax of converted file
-            syntax_valid = True
-            try:
-                ast.parse(converted_code)
-            except SyntaxError:
-                syntax_valid = False
+            syntax_valid = find_syntax_error(converted_code) is None
 
             # 6. Determine status
             total_original = sum(original_issues.values())
@@ -1479,6 +2672,14 @@ Use `six` or `future` libraries for compatibility.
                     "action": "Manual conversion required"
                 })
 
+            # 8. Suggest next steps, leaving out the ones that don't apply
+            next_steps = [
+                "Run validate_conversion for detailed review items" if remaining_issues else "Run test suite to verify behavior",
+                "Check division operations for int vs float" if total_fixed > 0 else None,
+                "Review file I/O for encoding issues" if any('file' in p or 'io' in p.lower() for p in fixed_issues) else None,
+            ]
+            next_steps = [s for s in next_steps if s]
+
             response = create_response(
                 tool_name=name,
                 status="success",
@@ -1498,20 +2699,11 @@ Use `six` or `future` libraries for compatibility.
                     "fixed_patterns": fixed_issues,
                     "remaining_patterns": remaining_issues,
                     "needs_attention": needs_attention,
-                    "next_steps": [
-                        "Run validate_conversion for detailed review items" if remaining_issues else "Run test suite to verify behavior",
-                        "Check division operations for int vs float" if total_fixed > 0 else None,
-                        "Review file I/O for encoding issues" if any('file' in p or 'io' in p.lower() for p in fixed_issues) else None,
-                    ]
+                    "next_steps": next_steps,
                 },
                 metadata={"limits": LIMITS}
             )
 
-            # Clean up None values from next_steps
-            response_dict = json.loads(response)
-            response_dict["data"]["next_steps"] = [s for s in response_dict["data"]["next_steps"] if s]
-            response = json.dumps(response_dict, indent=2)
-
             return [TextContent(type="text", text=response)]
 
         except Exception as e:
@@ -1519,6 +2711,18 @@ Use `six` or `future` libraries for compatibility.
 
     elif name == "scan_compat":
         files = arguments.get("files", [])
+        mode = arguments.get("mode", "full")
+
+        if mode not in ("full", "any"):
+            error_resp = create_response(
+                tool_name=name,
+                status="error",
+                error={
+                    "type": "InvalidMode",
+                    "message": f"Unknown scan mode: {mode} (expected 'full' or 'any')",
+                }
+            )
+            return [TextContent(type="text", text=error_resp)]
 
         if not files:
             error_resp = create_response(
@@ -1531,338 +2735,49 @@ Use `six` or `future` libraries for compatibility.
             )
             return [TextContent(type="text", text=error_resp)]
 
-        # FR-4.2: Issue classification with severity and categories
-        COMPAT_PATTERNS = {
-            # Deprecated functions (iterators)
-            "xrange": {
-                "pattern": r'\bxrange\s*\(',
-                "code": "PY2-ITER-001",
-                "message": "xrange() is not available in Python 3",
-                "suggested_fix": "Use range() instead",
-                "severity": "error",
-                "category": "iterators"
-            },
-            "iteritems": {
-                "pattern": r'\.iteritems\s*\(',
-                "code": "PY2-ITER-002",
-                "message": "dict.iteritems() is not available in Python 3",
-                "suggested_fix": "Use dict.items() instead",
-                "severity": "error",
-                "category": "iterators"
-            },
-            "itervalues": {
-                "pattern": r'\.itervalues\s*\(',
-                "code": "PY2-ITER-003",
-                "message": "dict.itervalues() is not available in Python 3",
-                "suggested_fix": "Use dict.values() instead",
-                "severity": "error",
-                "category": "iterators"
-            },
-            "iterkeys": {
-                "pattern": r'\.iterkeys\s*\(',
-                "code": "PY2-ITER-004",
-                "message": "dict.iterkeys() is not available in Python 3",
-                "suggested_fix": "Use dict.keys() instead",
-                "severity": "error",
-                "category": "iterators"
-            },
-            "has_key": {
-                "pattern": r'\.has_key\s*\(',
-                "code": "PY2-ITER-005",
-                "message": "dict.has_key() is not available in Python 3",
-                "suggested_fix": "Use 'key in dict' instead",
-                "severity": "error",
-                "category": "iterators"
-            },
-
-            # Obsolete type names (text-types)
-            "unicode_type": {
-                "pattern": r'\bunicode\s*\(',
-                "code": "PY2-TYPE-001",
-                "message": "unicode() is not available in Python 3",
-                "suggested_fix": "Use str() instead",
-                "severity": "error",
-                "category": "text-types"
-            },
-            "long_type": {
-                "pattern": r'(?:\d+|0[xX][0-9a-fA-F]+)[lL]\b',
-                "code": "PY2-TYPE-002",
-                "message": "Long integer suffix L is not valid in Python 3",
-                "suggested_fix": "Remove the L suffix",
-                "severity": "error",
-                "category": "text-types"
-            },
-            "basestring": {
-                "pattern": r'\bbasestring\b',
-                "code": "PY2-TYPE-003",
-                "message": "basestring is not available in Python 3",
-                "suggested_fix": "Use str instead",
-                "severity": "error",
-                "category": "text-types"
-            },
-            "unicode_literal": {
-                "pattern": r'\bu["\']',
-                "code": "PY2-TYPE-004",
-                "message": "Unicode literal prefix u'' is unnecessary in Python 3",
-                "suggested_fix": "Remove the u prefix (all strings are unicode in Python 3)",
-                "severity": "info",
-                "category": "text-types"
-            },
-
-            # Legacy operators
-            "old_ne": {
-                "pattern": r'<>',
-                "code": "PY2-OP-001",
-                "message": "<> comparison operator is not valid in Python 3",
-                "suggested_fix": "Use != instead",
-                "severity": "error",
-                "category": "operators"
-            },
-            "backticks": {
-                "pattern": r'`[^`]+`',
-                "code": "PY2-OP-002",
-                "message": "Backticks for repr are not valid in Python 3",
-                "suggested_fix": "Use repr() instead",
-                "severity": "error",
-                "category": "operators"
-            },
-
-            # Outdated syntax
-            "print_statement": {
-                "pattern": r'^[^#]*\bprint\s+[^(=]',
-                "code": "PY2-SYN-001",
-                "message": "Print statement syntax is not valid in Python 3",
-                "suggested_fix": "Use print() function instead",
-                "severity": "error",
-                "category": "syntax"
-            },
-            "except_comma": {
-                "pattern": r'except\s+[\w.]+\s*,\s*\w+',
-                "code": "PY2-SYN-002",
-                "message": "Old except syntax with comma is not valid in Python 3",
-                "suggested_fix": "Use 'except Exception as e:' instead",
-                "severity": "error",
-                "category": "syntax"
-            },
-            "old_raise": {
-                "pattern": r'raise\s+[\w.]+\s*,',
-                "code": "PY2-SYN-003",
-                "message": "Old raise syntax is not valid in Python 3",
-                "suggested_fix": "Use raise Exception('message') instead",
-                "severity": "error",
-                "category": "syntax"
-            },
-            "exec_statement": {
-                "pattern": r'^[^#]*\bexec\s+[^(]',
-                "code": "PY2-SYN-004",
-                "message": "exec statement syntax is not valid in Python 3",
-                "suggested_fix": "Use exec() function instead",
-                "severity": "error",
-                "category": "syntax"
-            },
-
-            # Relocated stdlib modules
-            "ConfigParser": {
-                "pattern": r'(?<!\w)ConfigParser\b',
-                "code": "PY2-LIB-001",
-                "message": "ConfigParser module was renamed in Python 3",
-                "suggested_fix": "Use 'import configparser' instead",
-                "severity": "error",
-                "category": "stdlib-move"
-            },
-            "StringIO": {
-                "pattern": r'(?<!\w)StringIO\b(?!\.)',
-                "code": "PY2-LIB-002",
-                "message": "StringIO module was moved in Python 3",
-                "suggested_fix": "Use 'from io import StringIO' instead",
-                "severity": "error",
-                "category": "stdlib-move"
-            },
-            "cStringIO": {
-                "pattern": r'\bcStringIO\b',
-                "code": "PY2-LIB-003",
-                "message": "cStringIO is not available in Python 3",
-                "suggested_fix": "Use 'from io import StringIO' instead",
-                "severity": "error",
-                "category": "stdlib-move"
-            },
-            "cPickle": {
-                "pattern": r'\bcPickle\b',
-                "code": "PY2-LIB-004",
-                "message": "cPickle is not available in Python 3",
-                "suggested_fix": "Use 'import pickle' instead (it's fast in Python 3)",
-                "severity": "error",
-                "category": "stdlib-move"
-            },
-            "Queue": {
-                "pattern": r'(?<!\w)Queue\b',
-                "code": "PY2-LIB-005",
-                "message": "Queue module was renamed in Python 3",
-                "suggested_fix": "Use 'import queue' instead",
-                "severity": "error",
-                "category": "stdlib-move"
-            },
-            "urllib2": {
-                "pattern": r'\burllib2\b',
-                "code": "PY2-LIB-006",
-                "message": "urllib2 is not available in Python 3",
-                "suggested_fix": "Use urllib.request and urllib.error instead",
-                "severity": "error",
-                "category": "stdlib-move"
-            },
-            "urlparse": {
-                "pattern": r'\burlparse\b',
-                "code": "PY2-LIB-007",
-                "message": "urlparse module was moved in Python 3",
-                "suggested_fix": "Use urllib.parse instead",
-                "severity": "error",
-                "category": "stdlib-move"
-            },
-            "httplib": {
-                "pattern": r'\bhttplib\b',
-                "code": "PY2-LIB-008",
-                "message": "httplib was renamed in Python 3",
-                "suggested_fix": "Use http.client instead",
-                "severity": "error",
-                "category": "stdlib-move"
-            },
-            "HTMLParser": {
-                "pattern": r'\bHTMLParser\b',
-                "code": "PY2-LIB-009",
-                "message": "HTMLParser module was moved in Python 3",
-                "suggested_fix": "Use html.parser instead",
-                "severity": "error",
-                "category": "stdlib-move"
-            },
-
-            # Other deprecated builtins
-            "raw_input": {
-                "pattern": r'\braw_input\s*\(',
-                "code": "PY2-BUILTIN-001",
-                "message": "raw_input() is not available in Python 3",
-                "suggested_fix": "Use input() instead",
-                "severity": "error",
-                "category": "builtins"
-            },
-            "execfile": {
-                "pattern": r'\bexecfile\s*\(',
-                "code": "PY2-BUILTIN-002",
-                "message": "execfile() is not available in Python 3",
-                "suggested_fix": "Use exec(open(file).read()) instead",
-                "severity": "error",
-                "category": "builtins"
-            },
-            "reduce": {
-                "pattern": r'(?<![\.\w])reduce\s*\(',
-                "code": "PY2-BUILTIN-003",
-                "message": "reduce() was moved to functools in Python 3",
-                "suggested_fix": "Use 'from functools import reduce'",
-                "severity": "warning",
-                "category": "builtins"
-            },
-            "apply": {
-                "pattern": r'(?<!\w)apply\s*\(',
-                "code": "PY2-BUILTIN-004",
-                "message": "apply() is not available in Python 3",
-                "suggested_fix": "Use func(*args, **kwargs) instead",
-                "severity": "error",
-                "category": "builtins"
-            },
-            "file_builtin": {
-                "pattern": r'(?<!\w)file\s*\(',
-                "code": "PY2-BUILTIN-005",
-                "message": "file() builtin is not available in Python 3",
-                "suggested_fix": "Use open() instead",
-                "severity": "error",
-                "category": "builtins"
-            },
-            "cmp_func": {
-                "pattern": r'\bcmp\s*\(',
-                "code": "PY2-BUILTIN-006",
-                "message": "cmp() is not available in Python 3",
-                "suggested_fix": "Use (a > b) - (a < b) or functools.cmp_to_key",
-                "severity": "error",
-                "category": "builtins"
-            },
-        }
-
         all_issues = []
         files_scanned = 0
         files_with_issues = 0
         category_counts = {}
         severity_counts = {"error": 0, "warning": 0, "info": 0}
 
-        for filepath in files:
-            if not os.path.isfile(filepath):
+        # Files are scanned in the worker pool, in batches, and merged back in order.
+        # In "any" mode a batch ends after its first file with hits, and the batches
+        # after the first such batch are cancelled, so outcomes stop at that file.
+        if mode == "any":
+            outcomes = await run_scan_batches(
+                files,
+                functools.partial(_compat_scan_batch, stop_at_hit=True),
+                stop_when=lambda batch_outcomes: any(hits for _, hits, _ in batch_outcomes),
+            )
+        else:
+            outcomes = await run_scan_batches(files, _compat_scan_batch)
+        for filepath, (scanned, hits, scan_error) in zip(files, outcomes):
+            files_scanned += scanned
+            if mode == "any":
+                # Only the file's first issue is reported
+                hits = hits[:1]
+            for line_num, pattern_info, source in hits:
                 all_issues.append({
                     "file": filepath,
-                    "line": 0,
-                    "code": "SCAN-ERR-001",
-                    "message": f"File not found: {filepath}",
-                    "severity": "error",
-                    "category": "scan-error"
+                    "line": line_num,
+                    "code": pattern_info["code"],
+                    "message": pattern_info["message"],
+                    "suggested_fix": pattern_info["suggested_fix"],
+                    "severity": pattern_info["severity"],
+                    "category": pattern_info["category"],
+                    "source": source
                 })
-                continue
 
-            # Check file size
-            try:
-                if os.path.getsize(filepath) > LIMITS["max_file_size_bytes"]:
-                    all_issues.append({
-                        "file": filepath,
-                        "line": 0,
-                        "code": "SCAN-ERR-002",
-                        "message": f"File exceeds size limit ({LIMITS['max_file_size_bytes']} bytes)",
-                        "severity": "warning",
-                        "category": "scan-error"
-                    })
-                    continue
-            except OSError:
-                continue
+                # Update counts
+                severity_counts[pattern_info["severity"]] += 1
+                cat = pattern_info["category"]
+                category_counts[cat] = category_counts.get(cat, 0) + 1
 
-            try:
-                with open(filepath, 'r', encoding='utf-8', errors='replace') as f:
-                    lines = f.readlines()
-
-                files_scanned += 1
-                file_has_issues = False
-
-                for line_num, line in enumerate(lines, 1):
-                    # Skip shebang and encoding lines
-                    if line_num <= 2 and (line.startswith('#!') or 'coding' in line):
-                        continue
-
-                    for pattern_name, pattern_info in COMPAT_PATTERNS.items():
-                        if re.search(pattern_info["pattern"], line):
-                            file_has_issues = True
-                            issue = {
-                                "file": filepath,
-                                "line": line_num,
-                                "code": pattern_info["code"],
-                                "message": pattern_info["message"],
-                                "suggested_fix": pattern_info["suggested_fix"],
-                                "severity": pattern_info["severity"],
-                                "category": pattern_info["category"],
-                                "source": line.strip()
-                            }
-                            all_issues.append(issue)
-
-                            # Update counts
-                            severity_counts[pattern_info["severity"]] += 1
-                            cat = pattern_info["category"]
-                            category_counts[cat] = category_counts.get(cat, 0) + 1
-
-                if file_has_issues:
-                    files_with_issues += 1
-
-            except Exception as e:
-                all_issues.append({
-                    "file": filepath,
-                    "line": 0,
-                    "code": "SCAN-ERR-003",
-                    "message": f"Error reading file: {str(e)}",
-                    "severity": "error",
-                    "category": "scan-error"
-                })
+            if scan_error is not None:
+                all_issues.append(scan_error)
+            elif hits:
+                files_with_issues += 1
 
         response = create_response(
             tool_name=name,